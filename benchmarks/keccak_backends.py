@@ -0,0 +1,33 @@
+import argparse
+import os
+import time
+
+from py_flare_common.keccak import available_backends, keccak, keccak_many, set_backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keccak backends hashes per second")
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--size", type=int, default=64)
+    args = parser.parse_args()
+
+    items = [os.urandom(args.size) for _ in range(args.count)]
+    print(f"{args.count} inputs of {args.size} bytes")
+
+    for name in available_backends():
+        set_backend(name)
+
+        start = time.perf_counter()
+        for item in items:
+            keccak(item)
+        single = args.count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        keccak_many(items)
+        many = args.count / (time.perf_counter() - start)
+
+        print(f"{name:<14} keccak {single:>12,.0f}/s  keccak_many {many:>12,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import os
+import time
+
+from py_flare_common.merkle import BytesMerkleTree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BytesMerkleTree parallel build")
+    parser.add_argument("--leaves", type=int, default=2**18)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads", action="store_true")
+    parser.add_argument("--initial-hash", action="store_true")
+    args = parser.parse_args()
+
+    values = [os.urandom(32) for _ in range(args.leaves)]
+    pool = "threads" if args.threads else "processes"
+    print(f"{args.leaves} leaves, {pool}, {os.cpu_count()} cpus")
+
+    root = None
+    serial = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        tree = BytesMerkleTree(
+            values,
+            initial_hash=args.initial_hash,
+            workers=workers,
+            use_threads=args.threads,
+        )
+        elapsed = time.perf_counter() - start
+
+        root = root or tree.root
+        assert tree.root == root
+        serial = serial or elapsed
+        print(
+            f"workers={workers:<3} {elapsed:8.3f}s  speed-up {serial / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import random
+import time
+
+from py_flare_common.fsp.epoch import RewardEpochFactory
+from py_flare_common.fsp.messaging.batch import PayloadBatch
+from py_flare_common.fsp.messaging.types import FtsoSubmit2
+from py_flare_common.ftso import reward_epoch_medians
+from py_flare_common.ftso.pipeline import voting_round_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reward epoch median pipeline")
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--feeds", type=int, default=60)
+    parser.add_argument("--providers", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    factory = RewardEpochFactory(1658430000, 302400, 1658430000, 90, 45, 223)
+    reward_epoch = factory.make_epoch(1)
+    rounds = voting_round_ids(reward_epoch)[: args.rounds]
+
+    rng = random.Random(0)
+    providers = [f"0x{i:040x}" for i in range(args.providers)]
+    weights = {p: rng.randint(1, 10**6) for p in providers}
+    reveals = []
+    for voting_round_id in rounds:
+        batch = PayloadBatch(100, voting_round_id)
+        for provider in providers:
+            values = [rng.randint(-(2**20), 2**20) for _ in range(args.feeds)]
+            batch.payloads.append(FtsoSubmit2(0, values))
+            batch.senders.append(provider)
+        reveals.append(batch)
+
+    medians = len(rounds) * args.feeds
+    print(
+        f"{len(rounds)} rounds, {args.feeds} feeds, {args.providers} providers, "
+        f"{os.cpu_count()} cpus"
+    )
+
+    serial = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        for _ in reward_epoch_medians(reward_epoch, reveals, weights, workers):
+            pass
+        elapsed = time.perf_counter() - start
+
+        serial = serial or elapsed
+        print(
+            f"workers={workers:<3} {elapsed:8.3f}s  {len(rounds) / elapsed:8.1f} "
+            f"rounds/s  {medians / elapsed:10.1f} medians/s  "
+            f"speed-up {serial / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
-import string
+import re
+from typing import TypeVar, overload
 
 __all__ = []
 
+B = TypeVar("B", bytes, bytearray, memoryview)
+
+_HEX_STR = re.compile(r"[0-9a-fA-F]*")
+
 
 def un_prefix_0x(s: str) -> str:
     return s.removeprefix("0x")
@@ -13,7 +18,7 @@ def prefix_0x(s: str) -> str:
 
 def is_hex_str(s: str):
     s = un_prefix_0x(s)
-    return all(c in string.hexdigits for c in s)
+    return _HEX_STR.fullmatch(s) is not None
 
 
 SUBMISSION_METHOD_SELECTORS = {
@@ -24,8 +29,16 @@ SUBMISSION_METHOD_SELECTORS = {
 }
 
 
-def to_bytes(s: str | bytes) -> bytes:
-    # cleanup string and convert to bytes
+@overload
+def to_bytes(s: str) -> bytes: ...
+
+
+@overload
+def to_bytes(s: B) -> B: ...
+
+
+def to_bytes(s):
+    # cleanup string and convert to bytes, binary input is only sliced
     if isinstance(s, str):
         s = un_prefix_0x(s)
 
@@ -35,7 +48,7 @@ def to_bytes(s: str | bytes) -> bytes:
         s = bytes.fromhex(s)
 
     # "magic" detection of function signature
-    if s[0:4] in SUBMISSION_METHOD_SELECTORS:
+    if bytes(s[0:4]) in SUBMISSION_METHOD_SELECTORS:
         s = s[4:]
 
     return s
@@ -1,7 +1,11 @@
 from .attestation_source import AttestationSource
 from .attestation_type import AttestationType
+from .consensus import ConsensusBitvector, consensus_bitvector, weighted_support
 
 __all__ = [
     "AttestationType",
     "AttestationSource",
+    "ConsensusBitvector",
+    "consensus_bitvector",
+    "weighted_support",
 ]
@@ -0,0 +1,234 @@
+from collections.abc import Sequence
+
+from attrs import frozen
+
+from py_flare_common.fsp.messaging.types import Bitvector, PackedBitvector
+
+__all__ = ["ConsensusBitvector", "consensus_bitvector", "weighted_support"]
+
+
+@frozen
+class ConsensusBitvector:
+    bitvector: PackedBitvector
+    support: int
+    total_weight: int
+
+
+def _packed(vote: Bitvector | PackedBitvector) -> PackedBitvector:
+    if isinstance(vote, PackedBitvector):
+        return vote
+    return PackedBitvector.from_list(vote.bit_vector)
+
+
+def _check_votes(
+    votes: Sequence[Bitvector | PackedBitvector], weights: Sequence[int]
+) -> list[PackedBitvector]:
+    if len(votes) != len(weights):
+        raise ValueError("Votes and weights must have the same length.")
+    if any(w < 0 for w in weights):
+        raise ValueError("Weights must be non-negative.")
+
+    packed = [_packed(v) for v in votes]
+    if len({v.number_of_requests for v in packed}) > 1:
+        raise ValueError("Bitvectors have different number of requests.")
+    return packed
+
+
+def weighted_support(
+    votes: Sequence[Bitvector | PackedBitvector], weights: Sequence[int]
+) -> list[int]:
+    """Sum of weights of the providers that voted for each request."""
+    packed = _check_votes(votes, weights)
+    if not packed:
+        return []
+
+    n = packed[0].number_of_requests
+    if n == 0:
+        return []
+
+    # Every bit is spread into its own hex lane wide enough to hold the total
+    # weight, so all requests are summed at once with big integer arithmetic
+    lane = max(1, (sum(weights).bit_length() + 3) // 4)
+    spread = str.maketrans({"0": "0" * lane, "1": "0" * (lane - 1) + "1"})
+
+    acc = 0
+    for vote, weight in zip(packed, weights, strict=True):
+        value = vote.value
+        if weight and value:
+            acc += int(format(value, f"0{n}b").translate(spread), 16) * weight
+
+    lanes = format(acc, f"0{n * lane}x")
+    return [int(lanes[i : i + lane], 16) for i in range(0, n * lane, lane)]
+
+
+def _reachable_score(
+    requests: int, support: int, remaining: list[tuple[int, int]], majority: int
+) -> int:
+    # Upper bound of requests * support below a node. A narrowed candidate
+    # with k requests can only gain the support of remaining votes that
+    # share at least k requests with the current candidate. -1 if no node
+    # below can reach the majority.
+    bound = requests * support if support > majority else -1
+    for shared, weight in sorted(remaining, reverse=True):
+        support += weight
+        if support > majority:
+            bound = max(bound, shared * support)
+    return bound
+
+
+def consensus_bitvector(
+    votes: Sequence[Bitvector | PackedBitvector],
+    weights: Sequence[int],
+    total_weight: int | None = None,
+    max_steps: int = 10_000,
+) -> ConsensusBitvector | None:
+    """Pick the consensus bitvector of the submitted votes.
+
+    A candidate is supported by every provider whose vote contains all of its
+    requests and it is eligible when its support is more than half of
+    `total_weight` (sum of `weights` by default, pass the full signing weight
+    to account for providers that did not submit). Candidates are the
+    intersections of any group of votes, so the consensus need not have been
+    submitted by anyone. Among eligible candidates the one with the most
+    `requests * support` wins, ties are broken by higher support and then by
+    the larger bitvector value. Returns None if no candidate reaches the
+    majority, an empty bitvector is only returned if it was submitted.
+
+    A greedy pass that drops one request per step gives the first candidate,
+    then the intersections are searched with branch and bound. Both count
+    against `max_steps`, each step is linear in the number of distinct votes.
+    If they do not finish in time the best candidate found so far is
+    returned, it is still a deterministic function of the votes.
+    """
+    packed = _check_votes(votes, weights)
+    if total_weight is None:
+        total_weight = sum(weights)
+    if not packed:
+        return None
+
+    n = packed[0].number_of_requests
+    majority = total_weight // 2
+
+    # Every request of an eligible candidate is itself supported by the
+    # majority, the other requests are dropped from the votes up front
+    allowed = 0
+    for i, request_support in enumerate(weighted_support(packed, weights)):
+        if request_support > majority:
+            allowed |= 1 << (n - 1 - i)
+
+    # Equal votes are merged, heavier ones first so that good candidates are
+    # found early and more of the search is pruned
+    grouped: dict[int, int] = {}
+    for vote, weight in zip(packed, weights, strict=True):
+        value = vote.value & allowed
+        grouped[value] = grouped.get(value, 0) + weight
+    items = sorted(grouped.items(), key=lambda i: (-i[1], -i[0]))
+    submitted = {vote.value for vote in packed}
+
+    def supporters(candidate: int, known: int = 0) -> tuple[int, int]:
+        # Bitmask of the votes that contain candidate and their weight, votes
+        # in known are supporters already and are not checked again
+        mask = known
+        support = 0
+        for i, (value, weight) in enumerate(items):
+            if known >> i & 1 or value & candidate == candidate:
+                mask |= 1 << i
+                support += weight
+        return mask, support
+
+    def evaluate(candidate: int, support: int):
+        nonlocal best_key
+        requests = candidate.bit_count()
+        if support > majority and (requests or candidate in submitted):
+            key = (requests * support, support, candidate)
+            if best_key is None or key > best_key:
+                best_key = key
+
+    def out_of_reach(requests: int) -> bool:
+        # No candidate with at most this many requests can beat the best one
+        return best_key is not None and requests * submitted_weight < best_key[0]
+
+    # Greedily drop the request that adds the most support, then the one
+    # missed by the most weight, the best candidate on the way is the first
+    # bound for the search. Every vote keeps the requests of the candidate it
+    # is missing, so a step only touches the votes missing the dropped one.
+    best_key = None
+    steps = 0
+    submitted_weight = sum(grouped.values())
+    candidate = allowed
+    missing = [candidate & ~value for value, _ in items]
+    support = 0
+    # Weight of the votes missing only the request, and of all votes missing it
+    gains: dict[int, int] = {}
+    missed: dict[int, int] = {}
+    for m, (_, weight) in zip(missing, items, strict=True):
+        if not m:
+            support += weight
+        elif not m & (m - 1):
+            gains[m] = gains.get(m, 0) + weight
+        while m:
+            bit = m & -m
+            missed[bit] = missed.get(bit, 0) + weight
+            m ^= bit
+
+    while candidate and steps < max_steps:
+        steps += 1
+        evaluate(candidate, support)
+        # Without votes left to gain, dropping more requests only loses score
+        if not missed or out_of_reach(candidate.bit_count() - 1):
+            break
+
+        _, _, bit = max((gains.get(b, 0), w, -b) for b, w in missed.items())
+        bit = -bit
+
+        candidate &= ~bit
+        support += gains.pop(bit, 0)
+        del missed[bit]
+        for i, m in enumerate(missing):
+            if m & bit:
+                m &= ~bit
+                missing[i] = m
+                if m and not m & (m - 1):
+                    gains[m] = gains.get(m, 0) + items[i][1]
+
+    # Depth first over groups of votes, every node is the intersection of a
+    # group together with all votes that contain it. A group is only extended
+    # by votes after the last one added and a child is skipped if a passed
+    # over vote supports it, so every intersection is visited at most once.
+    # Supporters of a child are found when it is taken off the stack, only
+    # checking the votes that did not support its parent.
+    stack = [(0, allowed, 0, -1)]
+    while stack and steps < max_steps:
+        steps += 1
+        start, candidate, known, added = stack.pop()
+        supported, support = supporters(candidate, known)
+        if added >= 0 and supported & ~known & ((1 << added) - 1):
+            continue
+
+        requests = candidate.bit_count()
+        evaluate(candidate, support)
+        if out_of_reach(requests):
+            continue
+
+        remaining = [
+            ((candidate & value).bit_count(), weight)
+            for i, (value, weight) in enumerate(items[start:], start)
+            if not supported >> i & 1
+        ]
+        bound = _reachable_score(requests, support, remaining, majority)
+        if bound < 0 or (best_key is not None and bound < best_key[0]):
+            continue
+
+        # Children of heavier votes are searched first
+        for i in range(len(items) - 1, start - 1, -1):
+            if not supported >> i & 1:
+                stack.append((i + 1, candidate & items[i][0], supported, i))
+
+    if best_key is None:
+        return None
+
+    return ConsensusBitvector(
+        bitvector=PackedBitvector.from_int(n, best_key[2]),
+        support=best_key[1],
+        total_weight=total_weight,
+    )
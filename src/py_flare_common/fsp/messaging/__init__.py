@@ -1,14 +1,27 @@
+from .batch import SubmitTx, parse_tx_batch
 from .parse import (
     parse_bitvector,
     parse_generic_tx,
+    parse_packed_bitvector,
     parse_submit1_tx,
     parse_submit2_tx,
     parse_submit_signature_tx,
 )
+from .reader import ReadProgress, read_message_batches, read_messages
+from .signers import message_digest, recover_signers, signature_weight
 
 __all__ = [
+    "SubmitTx",
+    "parse_tx_batch",
+    "ReadProgress",
+    "read_message_batches",
+    "read_messages",
+    "message_digest",
+    "recover_signers",
+    "signature_weight",
     "parse_bitvector",
     "parse_generic_tx",
+    "parse_packed_bitvector",
     "parse_submit1_tx",
     "parse_submit2_tx",
     "parse_submit_signature_tx",
@@ -0,0 +1,88 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Generic
+
+from attrs import field, frozen
+
+from .byte_parser import ParseError
+from .types import ParsedMessage, T
+
+__all__ = ["PayloadBatch", "SubmitTx", "parse_tx_batch"]
+
+
+@frozen
+class SubmitTx:
+    data: bytes | str
+    sender: str | None = None
+    block_number: int | None = None
+    timestamp: int | None = None
+
+
+# Payloads of one protocol in one voting round, i-th element of every list
+# belongs to the same transaction
+@frozen
+class PayloadBatch(Generic[T]):
+    protocol_id: int
+    voting_round_id: int
+    payloads: list[T] = field(factory=list)
+    sizes: list[int] = field(factory=list)
+    senders: list[str | None] = field(factory=list)
+    block_numbers: list[int | None] = field(factory=list)
+    timestamps: list[int | None] = field(factory=list)
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+
+def _parse(
+    parse: Callable[[bytes | str], ParsedMessage], skip_errors: bool, data: bytes | str
+) -> ParsedMessage | None:
+    try:
+        return parse(data)
+    except (ParseError, ValueError):
+        if skip_errors:
+            return None
+        raise
+
+
+def parse_tx_batch(
+    txs: Iterable[SubmitTx | bytes | str],
+    parse: Callable[[bytes | str], ParsedMessage[Any, Any]],
+    workers: int = 1,
+    chunksize: int = 256,
+    skip_errors: bool = False,
+) -> dict[tuple[int, int], PayloadBatch]:
+    # `parse` is one of parse_submit1_tx, parse_submit2_tx,
+    # parse_submit_signature_tx or any other picklable function if workers > 1
+    txs = [tx if isinstance(tx, SubmitTx) else SubmitTx(tx) for tx in txs]
+    parse_one = partial(_parse, parse, skip_errors)
+    data = [tx.data for tx in txs]
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            messages = list(executor.map(parse_one, data, chunksize=chunksize))
+    else:
+        messages = list(map(parse_one, data))
+
+    batches: dict[tuple[int, int], PayloadBatch] = {}
+    for tx, message in zip(txs, messages, strict=True):
+        if message is None:
+            continue
+
+        for parsed in (message.ftso, message.fdc):
+            if parsed is None:
+                continue
+
+            key = (parsed.protocol_id, parsed.voting_round_id)
+            batch = batches.get(key)
+            if batch is None:
+                batch = batches[key] = PayloadBatch(*key)
+
+            batch.payloads.append(parsed.payload)
+            batch.sizes.append(parsed.size)
+            batch.senders.append(tx.sender)
+            batch.block_numbers.append(tx.block_number)
+            batch.timestamps.append(tx.timestamp)
+
+    return batches
@@ -1,14 +1,32 @@
+import struct
+
 __all__ = []
 
+_INT_STRUCTS = {
+    (1, False): struct.Struct(">B"),
+    (1, True): struct.Struct(">b"),
+    (2, False): struct.Struct(">H"),
+    (2, True): struct.Struct(">h"),
+    (4, False): struct.Struct(">I"),
+    (4, True): struct.Struct(">i"),
+    (8, False): struct.Struct(">Q"),
+    (8, True): struct.Struct(">q"),
+}
+
 
 class ParseError(Exception):
     pass
 
 
 class ByteParser:
-    def __init__(self, b: bytes) -> None:
-        self._b = b
+    # With zero_copy the parser works on a memoryview, so consumed bytes and
+    # sub parsers are views of the same underlying buffer instead of copies
+    def __init__(
+        self, b: bytes | bytearray | memoryview, zero_copy: bool = False
+    ) -> None:
+        self._b = memoryview(b) if zero_copy else b
         self._pointer = 0
+        self.zero_copy = zero_copy
 
     def _move_pointer(self, n: int) -> int:
         p = self._pointer
@@ -17,12 +35,16 @@ class ByteParser:
             raise ParseError("Tried to parse bytes out of range.")
         return p
 
-    def _consume(self, n: int) -> bytes:
+    def _consume(self, n: int) -> bytes | memoryview:
         p = self._move_pointer(n)
         return self._b[p : self._pointer]
 
     def _parse_int(self, size: int, signed: bool) -> int:
-        return int.from_bytes(self._consume(size), signed=signed)
+        p = self._move_pointer(size)
+        s = _INT_STRUCTS.get((size, signed))
+        if s is not None:
+            return s.unpack_from(self._b, p)[0]
+        return int.from_bytes(self._b[p : self._pointer], signed=signed)
 
     def uint8(self) -> int:
         return self._parse_int(1, False)
@@ -60,13 +82,16 @@ class ByteParser:
     def int256(self) -> int:
         return self._parse_int(32, True)
 
-    def next_n(self, n) -> bytes:
+    def next_n(self, n) -> bytes | memoryview:
         return self._consume(n)
 
+    def sub_parser(self, n: int) -> "ByteParser":
+        return ByteParser(self._consume(n), zero_copy=self.zero_copy)
+
     def is_empty(self) -> bool:
         return self._pointer == len(self._b)
 
-    def drain(self) -> bytes:
+    def drain(self) -> bytes | memoryview:
         return self._consume(len(self) - self._pointer)
 
     def __len__(self) -> int:
@@ -1,3 +1,5 @@
+import sys
+from array import array
 from collections.abc import Callable
 
 from py_flare_common._hexstr.hexstr import to_bytes
@@ -9,6 +11,8 @@ from .types import (
     FdcSubmit2,
     FtsoSubmit1,
     FtsoSubmit2,
+    LazyParsedPayload,
+    PackedBitvector,
     ParsedMessage,
     ParsedPayload,
     Signature,
@@ -19,8 +23,11 @@ from .types import (
 )
 
 __all__ = [
+    "decode_feed_values",
+    "decode_feed_values_array",
     "parse_bitvector",
     "parse_generic_tx",
+    "parse_packed_bitvector",
     "parse_submit1_tx",
     "parse_submit2_tx",
     "parse_submit_signature_tx",
@@ -29,19 +36,30 @@ __all__ = [
 
 EMPTY_FEED_VALUE = "0" * 8
 
+# Empty feed value (0) after the 2**31 offset is removed
+MISSING_FEED_VALUE = -(2**31)
+
 
 def _default_parse(b: bytes) -> bytes:
     return b
 
 
+# With zero_copy the payloads are handed to the parse functions as memoryviews
+# of the message instead of bytes copies. With lazy only the payload headers are
+# read and payloads are parsed on first access of LazyParsedPayload.payload
 def parse_generic_tx(
-    message: bytes | str,
+    message: bytes | bytearray | memoryview | str,
     pid_100_parse: Callable[[bytes], T] = _default_parse,
     pid_200_parse: Callable[[bytes], U] = _default_parse,
+    zero_copy: bool = False,
+    lazy: bool = False,
 ) -> ParsedMessage[T, U]:
-    kwargs: dict[str, ParsedPayload | None] = {"ftso": None, "fdc": None}
+    kwargs: dict[str, ParsedPayload | LazyParsedPayload | None] = {
+        "ftso": None,
+        "fdc": None,
+    }
     message = to_bytes(message)
-    bp = ByteParser(message)
+    bp = ByteParser(message, zero_copy=zero_copy)
 
     while not bp.is_empty():
         protocol_id = bp.uint8()
@@ -49,39 +67,54 @@ def parse_generic_tx(
         payload_length = bp.uint16()
         payload = bp.next_n(payload_length)
 
-        if protocol_id == 100:
-            parsed = pid_100_parse(payload)
-            kwargs["ftso"] = ParsedPayload(
-                protocol_id, voting_round_id, payload_length, parsed
+        match protocol_id:
+            case 100:
+                key, parse = "ftso", pid_100_parse
+            case 200:
+                key, parse = "fdc", pid_200_parse
+            case _:
+                continue
+
+        if lazy:
+            kwargs[key] = LazyParsedPayload(
+                protocol_id, voting_round_id, payload_length, bytes(payload), parse
             )
-
-        if protocol_id == 200:
-            parsed = pid_200_parse(payload)
-            kwargs["fdc"] = ParsedPayload(
-                protocol_id, voting_round_id, payload_length, parsed
+        else:
+            kwargs[key] = ParsedPayload(
+                protocol_id, voting_round_id, payload_length, parse(payload)
             )
 
     return ParsedMessage(**kwargs)
 
 
-def parse_submit1_tx(message: bytes | str) -> ParsedMessage[FtsoSubmit1, FdcSubmit1]:
-    return parse_generic_tx(message, ftso_submit1, fdc_submit1)
+def parse_submit1_tx(
+    message: bytes | bytearray | memoryview | str, lazy: bool = False
+) -> ParsedMessage[FtsoSubmit1, FdcSubmit1]:
+    return parse_generic_tx(
+        message, ftso_submit1, fdc_submit1, zero_copy=True, lazy=lazy
+    )
 
 
-def parse_submit2_tx(message: bytes | str) -> ParsedMessage[FtsoSubmit2, FdcSubmit2]:
-    return parse_generic_tx(message, ftso_submit2, fdc_submit2)
+def parse_submit2_tx(
+    message: bytes | bytearray | memoryview | str, lazy: bool = False
+) -> ParsedMessage[FtsoSubmit2, FdcSubmit2]:
+    return parse_generic_tx(
+        message, ftso_submit2, fdc_submit2, zero_copy=True, lazy=lazy
+    )
 
 
 def parse_submit_signature_tx(
-    message: bytes | str,
+    message: bytes | bytearray | memoryview | str, lazy: bool = False
 ) -> ParsedMessage[SubmitSignatures, SubmitSignatures]:
-    return parse_generic_tx(message, submit_signatures, submit_signatures)
+    return parse_generic_tx(
+        message, submit_signatures, submit_signatures, zero_copy=True, lazy=lazy
+    )
 
 
 def ftso_submit1(payload: bytes) -> FtsoSubmit1:
     if len(payload) != 32:
         raise ParseError("Invalid payload length: expected 32 bytes.")
-    return FtsoSubmit1(payload)
+    return FtsoSubmit1(bytes(payload))
 
 
 def fdc_submit1(payload: bytes) -> FdcSubmit1:
@@ -91,50 +124,65 @@ def fdc_submit1(payload: bytes) -> FdcSubmit1:
 
 
 def ftso_submit2(payload: bytes) -> FtsoSubmit2:
-    bp = ByteParser(payload)
+    bp = ByteParser(payload, zero_copy=True)
     random = bp.uint256()
-    values: list[int | None] = []
-
-    while not bp.is_empty():
-        raw_value = bp.next_n(4).hex()
-        value = int(raw_value, 16) - 2**31 if raw_value != EMPTY_FEED_VALUE else None
-        values.append(value)
+    values = decode_feed_values(bp.drain())
 
     return FtsoSubmit2(random=random, values=values)
 
 
-def parse_bitvector(payload: bytes) -> Bitvector:
-    bp = ByteParser(payload)
+def decode_feed_values_array(data: bytes | memoryview) -> array:
+    # Decodes all 4 byte feed values at once into an int32 array, empty values
+    # are MISSING_FEED_VALUE
+    if len(data) % 4 != 0:
+        raise ParseError("Invalid payload length.")
+
+    # Flipping the top bit of an uint32 equals subtracting 2**31 from it
+    n = len(data) // 4
+    flipped = int.from_bytes(data) ^ int.from_bytes(b"\x80\x00\x00\x00" * n)
+
+    values = array("i", flipped.to_bytes(len(data)))
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+def decode_feed_values(data: bytes | memoryview) -> list[int | None]:
+    return [
+        v if v != MISSING_FEED_VALUE else None
+        for v in decode_feed_values_array(data).tolist()
+    ]
+
+
+def parse_packed_bitvector(payload: bytes) -> PackedBitvector:
+    bp = ByteParser(payload, zero_copy=True)
     n_requests = bp.uint16()
 
-    votes = bp.drain()
-    bit_vector = [False for _ in range(n_requests)]
+    votes = int.from_bytes(bp.drain())
+    if votes >> n_requests:
+        raise ParseError("Invalid payload length.")
 
-    for j, byte in enumerate(reversed(votes)):
-        for shift in range(8):
-            i = n_requests - 1 - j * 8 - shift
-            if i < 0 and (byte >> shift) & 1 == 1:
-                raise ParseError("Invalid payload length.")
-            elif i >= 0:
-                bit_vector[i] = (byte >> shift) & 1 == 1
+    return PackedBitvector.from_int(n_requests, votes)
 
-    return Bitvector(
-        number_of_requests=n_requests,
-        bit_vector=bit_vector,
-    )
+
+def parse_bitvector(payload: bytes) -> Bitvector:
+    return parse_packed_bitvector(payload).to_bitvector()
 
 
 def fdc_submit2(payload: bytes) -> FdcSubmit2:
     return parse_bitvector(payload)
 
 
+def fdc_submit2_packed(payload: bytes) -> PackedBitvector:
+    return parse_packed_bitvector(payload)
+
+
 def submit_signatures_type_0(payload: bytes) -> SubmitSignatures:
-    payload_bp = ByteParser(payload)
-    message_to_parse = payload_bp.next_n(38)
-    signature_to_parse = payload_bp.next_n(65)
-    unsigned_message = payload_bp.drain()
+    payload_bp = ByteParser(payload, zero_copy=True)
+    message_bp = payload_bp.sub_parser(38)
+    signature_bp = payload_bp.sub_parser(65)
+    unsigned_message = bytes(payload_bp.drain())
 
-    message_bp = ByteParser(message_to_parse)
     protocol_id = message_bp.uint8()
     message_bp.next_n(4)
     random_quality_score = message_bp.uint8()
@@ -146,7 +194,6 @@ def submit_signatures_type_0(payload: bytes) -> SubmitSignatures:
         merkle_root=merkle_root,
     )
 
-    signature_bp = ByteParser(signature_to_parse)
     v = signature_bp.next_n(1).hex()
     r = signature_bp.next_n(32).hex()
     s = signature_bp.next_n(32).hex()
@@ -162,11 +209,10 @@ def submit_signatures_type_0(payload: bytes) -> SubmitSignatures:
 
 
 def submit_signatures_type_1(payload: bytes) -> SubmitSignatures:
-    payload_bp = ByteParser(payload)
-    signature_to_parse = payload_bp.next_n(65)
-    unsigned_message = payload_bp.drain()
+    payload_bp = ByteParser(payload, zero_copy=True)
+    signature_bp = payload_bp.sub_parser(65)
+    unsigned_message = bytes(payload_bp.drain())
 
-    signature_bp = ByteParser(signature_to_parse)
     v = signature_bp.next_n(1).hex()
     r = signature_bp.next_n(32).hex()
     s = signature_bp.next_n(32).hex()
@@ -182,7 +228,7 @@ def submit_signatures_type_1(payload: bytes) -> SubmitSignatures:
 
 
 def submit_signatures(payload: bytes) -> SubmitSignatures:
-    payload_bp = ByteParser(payload)
+    payload_bp = ByteParser(payload, zero_copy=True)
     type = payload_bp.uint8()
     rest_of_payload = payload_bp.drain()
 
@@ -192,6 +238,6 @@ def submit_signatures(payload: bytes) -> SubmitSignatures:
         case 1:
             return submit_signatures_type_1(rest_of_payload)
         case _:
-            raise Exception(
+            raise ParseError(
                 f"Version {type} of SubmitSignatures payload is not defined."
             )
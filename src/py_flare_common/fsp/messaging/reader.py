@@ -0,0 +1,179 @@
+import mmap
+import os
+import struct
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, Literal
+
+from attrs import frozen
+
+from .byte_parser import ParseError
+from .types import ParsedMessage
+
+__all__ = [
+    "ReadProgress",
+    "iter_dump",
+    "read_message_batches",
+    "read_messages",
+    "write_binary_dump",
+]
+
+DumpFormat = Literal["hex", "binary"]
+
+# Binary dumps are a sequence of records, each a big endian uint32 length
+# followed by that many bytes of calldata
+_LENGTH = struct.Struct(">I")
+
+
+@frozen
+class ReadProgress:
+    messages: int
+    bytes_read: int
+    total_bytes: int
+    elapsed: float
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_read / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def write_binary_dump(path: str | os.PathLike, messages: Iterable[bytes]) -> None:
+    with open(path, "wb") as f:
+        for message in messages:
+            f.write(_LENGTH.pack(len(message)))
+            f.write(message)
+
+
+@contextmanager
+def _open_buffer(path: str | os.PathLike, use_mmap: bool):
+    # Empty files can not be memory mapped
+    with open(path, "rb") as f:
+        if not use_mmap or os.fstat(f.fileno()).st_size == 0:
+            yield f
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            yield m
+
+
+def _iter_hex(source) -> Iterator[tuple[str, int]]:
+    # Both file objects and mmaps support readline, the end of the last line
+    # is used as the number of bytes read
+    for line in iter(source.readline, b""):
+        line = line.strip()
+        if line:
+            yield line.decode("ascii"), source.tell()
+
+
+def _iter_binary(source) -> Iterator[tuple[bytes, int]]:
+    while header := source.read(_LENGTH.size):
+        if len(header) != _LENGTH.size:
+            raise ParseError("Truncated record length.")
+        (length,) = _LENGTH.unpack(header)
+        data = source.read(length)
+        if len(data) != length:
+            raise ParseError("Truncated record.")
+        yield data, source.tell()
+
+
+def iter_dump(
+    path: str | os.PathLike,
+    format: DumpFormat = "hex",
+    use_mmap: bool = True,
+) -> Iterator[tuple[str | bytes, int]]:
+    """Yield (calldata, bytes read so far) for every record of a dump.
+
+    `format="hex"` yields the lines of a newline delimited hex file as strings
+    (with or without 0x and the function selector, as accepted by the parse
+    functions), `format="binary"` yields bytes of records written by
+    `write_binary_dump`. The file is memory mapped or, with `use_mmap=False`,
+    read through a buffered file object, only one record is held in memory.
+    """
+    match format:
+        case "hex":
+            iter_records = _iter_hex
+        case "binary":
+            iter_records = _iter_binary
+        case _:
+            raise ValueError(f"Unknown dump format {format}.")
+
+    with _open_buffer(path, use_mmap) as source:
+        yield from iter_records(source)
+
+
+def read_messages(
+    path: str | os.PathLike,
+    parse: Callable[[str | bytes], ParsedMessage[Any, Any]],
+    format: DumpFormat = "hex",
+    use_mmap: bool = True,
+    skip_errors: bool = False,
+    progress: Callable[[ReadProgress], None] | None = None,
+    progress_every: int = 10_000,
+) -> Iterator[ParsedMessage[Any, Any]]:
+    """Lazily parse every record of a dump with `parse`.
+
+    `parse` is one of parse_submit1_tx, parse_submit2_tx,
+    parse_submit_signature_tx or any other function taking calldata.
+    `progress` is called every `progress_every` messages and once at the end.
+    """
+    total = os.path.getsize(path)
+    start = time.perf_counter()
+    count = 0
+    bytes_read = 0
+
+    def report():
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            progress(ReadProgress(count, bytes_read, total, elapsed))
+
+    for data, end in iter_dump(path, format, use_mmap):
+        bytes_read = end
+        try:
+            message = parse(data)
+        except (ParseError, ValueError):
+            if not skip_errors:
+                raise
+        else:
+            count += 1
+            yield message
+            if count % progress_every == 0:
+                report()
+
+    report()
+
+
+def read_message_batches(
+    path: str | os.PathLike,
+    parse: Callable[[str | bytes], ParsedMessage[Any, Any]],
+    batch_size: int = 1024,
+    format: DumpFormat = "hex",
+    use_mmap: bool = True,
+    skip_errors: bool = False,
+    progress: Callable[[ReadProgress], None] | None = None,
+) -> Iterator[list[ParsedMessage[Any, Any]]]:
+    # At most batch_size parsed messages are held in memory at once
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive.")
+
+    batch = []
+    for message in read_messages(
+        path,
+        parse,
+        format=format,
+        use_mmap=use_mmap,
+        skip_errors=skip_errors,
+        progress=progress,
+        progress_every=batch_size,
+    ):
+        batch.append(message)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
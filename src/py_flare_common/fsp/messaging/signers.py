@@ -0,0 +1,98 @@
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from eth_keys import KeyAPI
+from eth_keys.constants import SECPK1_N
+from eth_keys.exceptions import BadSignature, ValidationError
+
+from py_flare_common.keccak import keccak
+
+from .types import SubmitSignatures, SubmitSignaturesMessage
+
+__all__ = [
+    "message_digest",
+    "recover_signer",
+    "recover_signers",
+    "signature_weight",
+]
+
+_ETH_MESSAGE_PREFIX = b"\x19Ethereum Signed Message:\n32"
+
+
+@lru_cache(maxsize=1024)
+def message_digest(message: SubmitSignaturesMessage, voting_round_id: int) -> bytes:
+    """Digest that providers sign for a protocol message Merkle root.
+
+    The message is encoded as abi.encodePacked(protocolId uint8,
+    votingRoundId uint32, isSecureRandom bool, merkleRoot bytes32), hashed and
+    prefixed as an Ethereum signed message. Results are cached per message, so
+    all signatures of one round share a single hash computation.
+    """
+    encoded = (
+        message.protocol_id.to_bytes(1)
+        + voting_round_id.to_bytes(4)
+        + message.random_quality_score.to_bytes(1)
+        + bytes.fromhex(message.merkle_root.removeprefix("0x"))
+    )
+    return keccak(_ETH_MESSAGE_PREFIX + keccak(encoded))
+
+
+def recover_signer(
+    digest: bytes, v: int | str, r: int | str, s: int | str
+) -> str | None:
+    """Recover the checksum address that signed `digest`, None if invalid.
+
+    `v`, `r` and `s` are ints or hex strings as in `Signature`, `v` is either
+    27/28 or the recovery id 0/1.
+    """
+    v, r, s = (int(i, 16) if isinstance(i, str) else i for i in (v, r, s))
+    if v >= 27:
+        v -= 27
+    if v not in (0, 1) or not 0 < r < SECPK1_N or not 0 < s < SECPK1_N:
+        return None
+
+    try:
+        signature = KeyAPI.Signature(vrs=(v, r, s))
+        public_key = signature.recover_public_key_from_msg_hash(digest)
+    except (BadSignature, ValidationError):
+        return None
+    return public_key.to_checksum_address()
+
+
+def _recover_one(item: tuple[bytes, str, str, str]) -> str | None:
+    return recover_signer(*item)
+
+
+def recover_signers(
+    signatures: Sequence[SubmitSignatures],
+    voting_round_id: int,
+    message: SubmitSignaturesMessage | None = None,
+    workers: int = 1,
+    chunksize: int = 64,
+) -> list[str | None]:
+    """Recover the signer address of every signature, None for invalid ones.
+
+    Type 0 signatures carry their own message, `message` is used for type 1
+    signatures that do not. Every distinct message is hashed once, signatures
+    are recovered across `workers` processes if more than 1.
+    """
+    items = []
+    for submit in signatures:
+        signed = submit.message or message
+        if signed is None:
+            raise ValueError("Signature without a message.")
+
+        signature = submit.signature
+        digest = message_digest(signed, voting_round_id)
+        items.append((digest, signature.v, signature.r, signature.s))
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            return list(executor.map(_recover_one, items, chunksize=chunksize))
+    return list(map(_recover_one, items))
+
+
+def signature_weight(signers: Iterable[str | None], weights: Mapping[str, int]) -> int:
+    # Sum of weights of distinct recovered signers, unknown signers count 0
+    return sum(weights.get(signer, 0) for signer in set(signers) if signer)
@@ -1,6 +1,7 @@
-from typing import Generic, TypeAlias, TypeVar
+from collections.abc import Callable
+from typing import Any, Generic, TypeAlias, TypeVar
 
-from attrs import frozen
+from attrs import field, frozen
 
 __all__ = []
 
@@ -16,10 +17,39 @@ class ParsedPayload(Generic[T]):
     payload: T
 
 
+# Keeps the raw payload and decodes it on the first access of `payload`, parse
+# errors are raised from there instead of from the parse function
+@frozen
+class LazyParsedPayload(Generic[T]):
+    protocol_id: int
+    voting_round_id: int
+    size: int
+    raw: bytes = field(repr=False)
+    _parse: Callable[[bytes], T] = field(repr=False, eq=False)
+    _payload: Any = field(default=None, init=False, repr=False, eq=False)
+    _decoded: bool = field(default=False, init=False, repr=False, eq=False)
+
+    @property
+    def payload(self) -> T:
+        if not self._decoded:
+            object.__setattr__(self, "_payload", self._parse(self.raw))
+            object.__setattr__(self, "_decoded", True)
+        return self._payload
+
+    @property
+    def decoded(self) -> bool:
+        return self._decoded
+
+    def to_parsed(self) -> ParsedPayload[T]:
+        return ParsedPayload(
+            self.protocol_id, self.voting_round_id, self.size, self.payload
+        )
+
+
 @frozen
 class ParsedMessage(Generic[T, U]):
-    fdc: ParsedPayload[U] | None
-    ftso: ParsedPayload[T] | None
+    fdc: ParsedPayload[U] | LazyParsedPayload[U] | None
+    ftso: ParsedPayload[T] | LazyParsedPayload[T] | None
 
 
 @frozen
@@ -47,6 +77,64 @@ class FdcSubmit2:
 Bitvector: TypeAlias = FdcSubmit2
 
 
+# Bitvector packed the same way as in the FDC submit2 payload, request 0 is the
+# most significant bit of the big endian `data`
+@frozen
+class PackedBitvector:
+    number_of_requests: int
+    data: bytes
+
+    @classmethod
+    def from_int(cls, number_of_requests: int, value: int) -> "PackedBitvector":
+        return cls(number_of_requests, value.to_bytes((number_of_requests + 7) // 8))
+
+    @classmethod
+    def from_list(cls, bit_vector: list[bool]) -> "PackedBitvector":
+        value = int("".join("1" if b else "0" for b in bit_vector) or "0", 2)
+        return cls.from_int(len(bit_vector), value)
+
+    @property
+    def value(self) -> int:
+        return int.from_bytes(self.data)
+
+    def __len__(self) -> int:
+        return self.number_of_requests
+
+    def __getitem__(self, i: int) -> bool:
+        if not 0 <= i < self.number_of_requests:
+            raise IndexError("Bitvector index out of range.")
+        shift = self.number_of_requests - 1 - i
+        return (self.data[len(self.data) - 1 - shift // 8] >> (shift % 8)) & 1 == 1
+
+    def popcount(self) -> int:
+        return self.value.bit_count()
+
+    def _check(self, other: "PackedBitvector"):
+        if self.number_of_requests != other.number_of_requests:
+            raise ValueError("Bitvectors have different number of requests.")
+
+    def __and__(self, other: "PackedBitvector") -> "PackedBitvector":
+        self._check(other)
+        return PackedBitvector.from_int(
+            self.number_of_requests, self.value & other.value
+        )
+
+    def __or__(self, other: "PackedBitvector") -> "PackedBitvector":
+        self._check(other)
+        return PackedBitvector.from_int(
+            self.number_of_requests, self.value | other.value
+        )
+
+    def to_list(self) -> list[bool]:
+        if self.number_of_requests == 0:
+            return []
+        bits = format(self.value, f"0{self.number_of_requests}b")
+        return [b == "1" for b in bits]
+
+    def to_bitvector(self) -> Bitvector:
+        return FdcSubmit2(self.number_of_requests, self.to_list())
+
+
 @frozen
 class SubmitSignaturesMessage:
     protocol_id: int
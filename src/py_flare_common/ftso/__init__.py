@@ -1,12 +1,28 @@
 from .commit import commit_hash
 from .fast_updates import encode_update_array
 from .feed import FtsoFeed
-from .median import FtsoVote, calculate_median
+from .incremental import IncrementalMedian
+from .median import (
+    FtsoQuartiles,
+    FtsoVote,
+    FtsoVotes,
+    calculate_median,
+    calculate_medians,
+)
+from .pipeline import RoundMedians, reward_epoch_medians
+from .reveals import RevealMatrix
 
 __all__ = [
     "FtsoFeed",
     "calculate_median",
+    "calculate_medians",
+    "FtsoQuartiles",
     "FtsoVote",
+    "FtsoVotes",
+    "IncrementalMedian",
+    "RevealMatrix",
+    "RoundMedians",
+    "reward_epoch_medians",
     "commit_hash",
     "encode_update_array",
 ]
@@ -1,5 +1,6 @@
 from eth_abi.abi import encode
-from eth_hash.auto import keccak
+
+from ..keccak import keccak
 
 __all__ = ["commit_hash"]
 
@@ -0,0 +1,190 @@
+import random
+from collections.abc import Iterable
+
+from .median import FtsoMedian, FtsoQuartiles, FtsoVote, _SortedVotes
+
+__all__ = ["IncrementalMedian"]
+
+
+class _Node:
+    __slots__ = ("key", "left", "priority", "right", "size", "total", "vote")
+
+    def __init__(self, vote: FtsoVote, seq: int, priority: int):
+        self.vote = vote
+        self.key = (vote.value, seq)
+        self.priority = priority
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+        self.size = 1
+        self.total = vote.weight
+
+    def update(self):
+        self.size = 1
+        self.total = self.vote.weight
+        if self.left is not None:
+            self.size += self.left.size
+            self.total += self.left.total
+        if self.right is not None:
+            self.size += self.right.size
+            self.total += self.right.total
+
+
+def _split(node: _Node | None, key: tuple[int, int]):
+    # Nodes with keys smaller than key go left, the rest right
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        node.update()
+        return node, right
+    left, right = _split(node.left, key)
+    node.left = right
+    node.update()
+    return left, node
+
+
+def _merge(left: _Node | None, right: _Node | None) -> _Node | None:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+class IncrementalMedian:
+    """Weighted median and quartiles of votes that arrive one by one.
+
+    Votes are kept in a treap ordered by (value, arrival), the same order
+    calculate_median gets by stable sorting the votes in arrival order, and
+    every node knows the weight of its subtree. `add` is O(log n) expected,
+    quartiles are found by descending the tree by cumulative weight and,
+    like the median, cached until the next `add`.
+    """
+
+    def __init__(self, votes: Iterable[FtsoVote] = ()):
+        self._root: _Node | None = None
+        self._votes: list[FtsoVote] = []
+        self._seq = 0
+        self._random = random.Random()
+        self._quartiles: FtsoQuartiles | None = None
+        self._median: FtsoMedian | None = None
+        self._dirty = False
+        for vote in votes:
+            self.add(vote)
+
+    def __len__(self) -> int:
+        return 0 if self._root is None else self._root.size
+
+    @property
+    def total_weight(self) -> int:
+        return 0 if self._root is None else self._root.total
+
+    def add(self, vote: FtsoVote):
+        node = _Node(vote, self._seq, self._random.getrandbits(32))
+        self._seq += 1
+        self._votes.append(vote)
+
+        left, right = _split(self._root, node.key)
+        self._root = _merge(_merge(left, node), right)
+        self._dirty = True
+        self._median = None
+
+    def _find(self, weight: int, strict: bool) -> tuple[int, int]:
+        # Rank and value of the first vote whose cumulative weight is more
+        # than (strict) or at least weight
+        node = self._root
+        rank = 0
+        acc = 0
+        while node is not None:
+            left = node.left
+            left_total = 0 if left is None else left.total
+            left_size = 0 if left is None else left.size
+
+            before = acc + left_total
+            if left is not None and (before > weight if strict else before >= weight):
+                node = left
+                continue
+
+            cumulative = before + node.vote.weight
+            if cumulative > weight if strict else cumulative >= weight:
+                return rank + left_size, node.vote.value
+
+            acc = cumulative
+            rank += left_size + 1
+            node = node.right
+
+        raise IndexError("Weight out of range.")
+
+    def _select(self, rank: int) -> int:
+        node = self._root
+        while node is not None:
+            left_size = 0 if node.left is None else node.left.size
+            if rank < left_size:
+                node = node.left
+            elif rank == left_size:
+                return node.vote.value
+            else:
+                rank -= left_size + 1
+                node = node.right
+        raise IndexError("Rank out of range.")
+
+    def quartiles(self) -> FtsoQuartiles | None:
+        # None while there are no votes or their total weight is 0
+        if not self._dirty:
+            return self._quartiles
+        self._dirty = False
+
+        total_weight = self.total_weight
+        if total_weight <= 0:
+            self._quartiles = None
+            return None
+
+        median_weight = total_weight // 2 + (total_weight % 2)
+        quartile_weight = total_weight // 4
+
+        rank, median = self._find(median_weight, strict=False)
+        if total_weight % 2 == 0 and self._find(median_weight, strict=True)[0] > rank:
+            # The cumulative weight at the median vote is exactly half
+            median = (median + self._select(rank + 1)) // 2
+
+        self._quartiles = FtsoQuartiles(
+            value=median,
+            first_quartile=self._find(quartile_weight, strict=True)[1],
+            third_quartile=self._find(total_weight - quartile_weight, strict=False)[1],
+        )
+        return self._quartiles
+
+    def sorted_votes(self) -> list[FtsoVote]:
+        votes = []
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            votes.append(node.vote)
+            node = node.right
+        return votes
+
+    def median(self) -> FtsoMedian | None:
+        # Cached until the next add. Votes are only appended to _votes, so
+        # sorted_votes shares it up to the current length instead of copying
+        quartiles = self.quartiles()
+        if quartiles is None:
+            return None
+        if self._median is None:
+            self._median = FtsoMedian(
+                value=quartiles.value,
+                first_quartile=quartiles.first_quartile,
+                third_quartile=quartiles.third_quartile,
+                sorted_votes=_SortedVotes(self._votes, len(self._votes)),
+            )
+        return self._median
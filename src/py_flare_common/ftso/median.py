@@ -1,6 +1,19 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import accumulate, islice
+from operator import attrgetter
+from typing import overload
+
 from attrs import frozen
 
-__all__ = ["calculate_median", "FtsoVote"]
+__all__ = [
+    "calculate_median",
+    "calculate_medians",
+    "FtsoQuartiles",
+    "FtsoVote",
+    "FtsoVotes",
+]
 
 
 @frozen
@@ -9,63 +22,211 @@ class FtsoVote:
     weight: int
 
 
+class FtsoVotes(Sequence[FtsoVote]):
+    """Votes stored as two parallel int64 arrays of values and weights.
+
+    Holds the same data as a list of FtsoVote without an object per vote,
+    indexing and iteration build FtsoVote objects on demand. Accepted by
+    calculate_median and calculate_medians in place of a list of votes.
+    """
+
+    def __init__(self, values: Iterable[int] = (), weights: Iterable[int] = ()) -> None:
+        self.values = array("q", values)
+        self.weights = array("q", weights)
+        if len(self.values) != len(self.weights):
+            raise ValueError("Values and weights must have the same length.")
+
+    @classmethod
+    def from_votes(cls, votes: Iterable[FtsoVote]) -> "FtsoVotes":
+        collection = cls()
+        for vote in votes:
+            collection.append(vote.value, vote.weight)
+        return collection
+
+    def append(self, value: int, weight: int):
+        self.values.append(value)
+        self.weights.append(weight)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @overload
+    def __getitem__(self, i: int) -> FtsoVote: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "FtsoVotes": ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return FtsoVotes(self.values[i], self.weights[i])
+        return FtsoVote(self.values[i], self.weights[i])
+
+    def __iter__(self) -> Iterator[FtsoVote]:
+        return map(FtsoVote, self.values, self.weights)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FtsoVotes):
+            return NotImplemented
+        return self.values == other.values and self.weights == other.weights
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return (
+            f"FtsoVotes(values={self.values.tolist()}, weights={self.weights.tolist()})"
+        )
+
+
+_vote_value = attrgetter("value")
+_vote_weight = attrgetter("weight")
+
+
+class _SortedVotes(Sequence[FtsoVote]):
+    # Votes sorted (stable) by value when first read, the sorted list is
+    # cached. Only the first `stop` votes are used, so an append only list
+    # can be shared without copying it.
+
+    def __init__(self, votes: Sequence[FtsoVote], stop: int | None = None) -> None:
+        self._votes = votes
+        self._stop = len(votes) if stop is None else stop
+        self._sorted: list[FtsoVote] | None = None
+
+    def _list(self) -> list[FtsoVote]:
+        if self._sorted is None:
+            self._sorted = sorted(islice(self._votes, self._stop), key=_vote_value)
+            self._votes = ()
+        return self._sorted
+
+    def __len__(self) -> int:
+        return self._stop
+
+    def __getitem__(self, i):
+        return self._list()[i]
+
+    def __iter__(self) -> Iterator[FtsoVote]:
+        return iter(self._list())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, list | FtsoVotes | _SortedVotes):
+            return NotImplemented
+        return self._list() == list(other)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return repr(self._list())
+
+
 @frozen
 class FtsoMedian:
     value: int
     first_quartile: int
     third_quartile: int
-    sorted_votes: list[FtsoVote]
+    # A list when the votes were sorted anyway, otherwise they are sorted
+    # when sorted_votes is first read
+    sorted_votes: Sequence[FtsoVote]
 
 
-def calculate_median(votes: list[FtsoVote]) -> FtsoMedian | None:
-    if len(votes) == 0:
-        return None
-
-    median = None
-    quartile_1 = None
-    quartile_3 = None
+@frozen
+class FtsoQuartiles:
+    value: int
+    first_quartile: int
+    third_quartile: int
 
-    # Sort the list by values if it is not already sorted.
-    if not (all(votes[i].value <= votes[i + 1].value for i in range(len(votes) - 1))):
-        votes.sort(key=lambda x: x.value)
 
-    total_weight = sum([vote.weight for vote in votes])
+def _median_quartiles(values: list[int], cumulative: list[int]) -> FtsoQuartiles | None:
+    # Values sorted (stable) with the cumulative weights of the sorted votes.
+    # Q1 is the first vote with cumulative weight over a quarter of the total,
+    # the median the first that reaches half of it (averaged with the next
+    # vote if exactly half of an even total) and Q3 the last with more than a
+    # quarter at or above it. Each is found by bisecting the cumulative weights
+    total_weight = cumulative[-1]
+    if total_weight <= 0:
+        return None
     median_weight = total_weight // 2 + (total_weight % 2)
     quartile_weight = total_weight // 4
-    current_weight_sum = 0
 
-    for i, vote in enumerate(votes):
-        current_weight_sum += vote.weight
+    i = bisect_left(cumulative, median_weight)
+    if cumulative[i] == median_weight and total_weight % 2 == 0:
+        median = (values[i] + values[i + 1]) // 2
+    else:
+        median = values[i]
 
-        if quartile_1 is None and current_weight_sum > quartile_weight:
-            quartile_1 = vote.value
+    return FtsoQuartiles(
+        value=median,
+        first_quartile=values[bisect_right(cumulative, quartile_weight)],
+        third_quartile=values[bisect_left(cumulative, total_weight - quartile_weight)],
+    )
 
-        if current_weight_sum >= median_weight:
-            if current_weight_sum == median_weight and total_weight % 2 == 0:
-                next_vote = votes[i + 1]
-                median = (vote.value + next_vote.value) // 2
-                break
-            else:
-                median = vote.value
-                break
 
-    current_weight_sum = 0
+def calculate_median(votes: list[FtsoVote] | FtsoVotes) -> FtsoMedian | None:
+    # Works on a sorted copy, the input is left as it is. FtsoVotes are
+    # copied as arrays, so appending to them later does not change the
+    # result, and the vote objects of sorted_votes are only built if read
+    if len(votes) == 0:
+        return None
 
-    for i in range(len(votes) - 1, -1, -1):
-        vote = votes[i]
-        current_weight_sum += vote.weight
+    if isinstance(votes, FtsoVotes):
+        votes = FtsoVotes(votes.values, votes.weights)
+        sorted_votes = _SortedVotes(votes)
+        quartiles = _quartiles(votes.values.tolist(), votes.weights.tolist())
+    else:
+        sorted_votes = sorted(votes, key=_vote_value)
+        quartiles = _median_quartiles(
+            list(map(_vote_value, sorted_votes)),
+            list(accumulate(map(_vote_weight, sorted_votes))),
+        )
+    if quartiles is None:
+        raise ValueError("Total weight of votes must be positive.")
 
-        if current_weight_sum > quartile_weight:
-            quartile_3 = vote.value
-            break
+    return FtsoMedian(
+        value=quartiles.value,
+        first_quartile=quartiles.first_quartile,
+        third_quartile=quartiles.third_quartile,
+        sorted_votes=sorted_votes,
+    )
 
-    assert median is not None
-    assert quartile_1 is not None
-    assert quartile_3 is not None
 
-    return FtsoMedian(
-        value=median,
-        first_quartile=quartile_1,
-        third_quartile=quartile_3,
-        sorted_votes=votes,
+def _quartiles(values: list[int], weights: list[int]) -> FtsoQuartiles | None:
+    order = sorted(range(len(values)), key=values.__getitem__)
+    return _median_quartiles(
+        [values[i] for i in order], list(accumulate(weights[i] for i in order))
     )
+
+
+def calculate_medians(
+    columns: Iterable[Sequence[int | None] | FtsoVotes],
+    weights: Sequence[int] | None = None,
+) -> list[FtsoQuartiles | None]:
+    """Median and quartiles of every feed in a round.
+
+    Each column holds the values of one feed, one per provider in the order
+    of `weights`, with None for providers that did not reveal it, or is an
+    FtsoVotes with its own weights. Results match calculate_median on the
+    votes of each column, feeds without votes or with zero total weight give
+    None.
+    """
+    results = []
+    for column in columns:
+        if isinstance(column, FtsoVotes):
+            results.append(
+                _quartiles(column.values.tolist(), column.weights.tolist())
+                if column
+                else None
+            )
+            continue
+
+        if weights is None:
+            raise ValueError("Weights are required for value columns.")
+        if len(column) != len(weights):
+            raise ValueError("Columns and weights must have the same length.")
+
+        values = []
+        feed_weights = []
+        for value, weight in zip(column, weights, strict=True):
+            if value is not None:
+                values.append(value)
+                feed_weights.append(weight)
+
+        results.append(_quartiles(values, feed_weights) if values else None)
+    return results
@@ -0,0 +1,103 @@
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from attrs import frozen
+
+from py_flare_common.fsp.epoch.epoch import RewardEpoch
+from py_flare_common.fsp.messaging.batch import PayloadBatch
+from py_flare_common.fsp.messaging.types import FtsoSubmit2
+
+from .median import FtsoMedian, calculate_median
+from .reveals import RevealMatrix
+
+__all__ = ["RoundMedians", "reward_epoch_medians", "voting_round_ids"]
+
+FTSO_PROTOCOL_ID = 100
+
+
+@frozen
+class RoundMedians:
+    voting_round_id: int
+    # One entry per feed index, None if no provider with weight revealed it
+    medians: list[FtsoMedian | None]
+
+
+def voting_round_ids(reward_epoch: RewardEpoch) -> range:
+    first = reward_epoch.to_first_voting_epoch().id
+    return range(first, reward_epoch.next.to_first_voting_epoch().id)
+
+
+def _round_medians(
+    voting_round_id: int, submits: list[FtsoSubmit2], weights: list[int]
+) -> RoundMedians:
+    matrix = RevealMatrix.from_submits(submits)
+
+    medians = []
+    for feed in range(matrix.n_feeds):
+        votes = matrix.feed_votes(feed, weights)
+        if sum(votes.weights) <= 0:
+            medians.append(None)
+        else:
+            medians.append(calculate_median(votes))
+    return RoundMedians(voting_round_id, medians)
+
+
+def _round_jobs(
+    reward_epoch: RewardEpoch,
+    reveals: Iterable[PayloadBatch[FtsoSubmit2]],
+    weights: Mapping[str, int],
+) -> Iterator[tuple[int, list[FtsoSubmit2], list[int]]]:
+    rounds = voting_round_ids(reward_epoch)
+    for batch in reveals:
+        if batch.protocol_id != FTSO_PROTOCOL_ID:
+            continue
+        if batch.voting_round_id not in rounds:
+            continue
+
+        # Later reveals of the same provider replace earlier ones, providers
+        # without weight in the reward epoch are left out
+        submits: dict[str, FtsoSubmit2] = {}
+        for sender, payload in zip(batch.senders, batch.payloads, strict=True):
+            if sender is not None and weights.get(sender, 0) > 0:
+                submits[sender] = payload
+
+        yield (
+            batch.voting_round_id,
+            list(submits.values()),
+            [weights[sender] for sender in submits],
+        )
+
+
+def reward_epoch_medians(
+    reward_epoch: RewardEpoch,
+    reveals: Iterable[PayloadBatch[FtsoSubmit2]],
+    weights: Mapping[str, int],
+    workers: int = 1,
+    prefetch: int = 4,
+) -> Iterator[RoundMedians]:
+    """Stream medians of every feed for each voting round of a reward epoch.
+
+    `reveals` are ftso submit2 batches as returned by parse_tx_batch, one per
+    voting round, `weights` maps provider (sender) addresses to their weight
+    in the reward epoch. Rounds outside the reward epoch and other protocols
+    are skipped. Results are yielded in the order of `reveals`, with
+    `workers` > 1 rounds are computed in a process pool and at most
+    `workers * prefetch` rounds are in flight at once.
+    """
+    jobs = _round_jobs(reward_epoch, reveals, weights)
+
+    if workers <= 1:
+        for job in jobs:
+            yield _round_medians(*job)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending: deque[Future[RoundMedians]] = deque()
+        for job in jobs:
+            pending.append(executor.submit(_round_medians, *job))
+            if len(pending) >= workers * prefetch:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
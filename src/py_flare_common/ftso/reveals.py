@@ -0,0 +1,145 @@
+from array import array
+from collections.abc import Sequence
+
+from py_flare_common.fsp.messaging.byte_parser import ParseError
+from py_flare_common.fsp.messaging.parse import (
+    MISSING_FEED_VALUE,
+    decode_feed_values_array,
+)
+from py_flare_common.fsp.messaging.types import FtsoSubmit2
+
+from .median import FtsoQuartiles, FtsoVote, FtsoVotes, calculate_medians
+
+__all__ = ["RevealMatrix"]
+
+
+class RevealMatrix:
+    """Feed values of all providers in one voting round.
+
+    Values are kept in a single int32 array in column major order (all
+    providers of feed 0, then all providers of feed 1, ...), so a feed column
+    is a contiguous slice that `column` returns as a memoryview without
+    copying. Missing values are stored as MISSING_FEED_VALUE and marked with 0
+    in the mask, which has the same layout. Providers that did not reveal or
+    revealed fewer feeds have the remaining values missing.
+    """
+
+    def __init__(self, rows: Sequence[array | None], n_feeds: int | None = None):
+        if n_feeds is None:
+            n_feeds = max((len(row) for row in rows if row is not None), default=0)
+
+        n_providers = len(rows)
+        self._n_providers = n_providers
+        self._n_feeds = n_feeds
+        self._values = array("i", [MISSING_FEED_VALUE]) * (n_providers * n_feeds)
+        self._mask = bytearray(n_providers * n_feeds)
+
+        for p, row in enumerate(rows):
+            if not row:
+                continue
+
+            row = row[:n_feeds]
+            if len(row) < n_feeds:
+                row.extend([MISSING_FEED_VALUE] * (n_feeds - len(row)))
+
+            # Strided slice assignment transposes the row into column p
+            self._values[p::n_providers] = row
+            self._mask[p::n_providers] = bytes(v != MISSING_FEED_VALUE for v in row)
+
+    @classmethod
+    def from_submits(
+        cls, submits: Sequence[FtsoSubmit2 | None], n_feeds: int | None = None
+    ) -> "RevealMatrix":
+        rows = [
+            None
+            if submit is None
+            else array(
+                "i", [MISSING_FEED_VALUE if v is None else v for v in submit.values]
+            )
+            for submit in submits
+        ]
+        return cls(rows, n_feeds)
+
+    @classmethod
+    def from_payloads(
+        cls,
+        payloads: Sequence[bytes | memoryview | None],
+        n_feeds: int | None = None,
+    ) -> "RevealMatrix":
+        # Raw ftso submit2 payloads, decoded straight to arrays without
+        # building FtsoSubmit2 objects
+        rows = []
+        for payload in payloads:
+            if payload is None:
+                rows.append(None)
+                continue
+            if len(payload) < 32:
+                raise ParseError("Tried to parse bytes out of range.")
+            rows.append(decode_feed_values_array(payload[32:]))
+        return cls(rows, n_feeds)
+
+    @property
+    def n_providers(self) -> int:
+        return self._n_providers
+
+    @property
+    def n_feeds(self) -> int:
+        return self._n_feeds
+
+    def _check_feed(self, feed: int):
+        if not 0 <= feed < self._n_feeds:
+            raise IndexError("Feed index out of range.")
+
+    def column(self, feed: int) -> memoryview:
+        self._check_feed(feed)
+        start = feed * self._n_providers
+        return memoryview(self._values)[start : start + self._n_providers]
+
+    def mask(self, feed: int) -> memoryview:
+        self._check_feed(feed)
+        start = feed * self._n_providers
+        return memoryview(self._mask)[start : start + self._n_providers]
+
+    def value(self, provider: int, feed: int) -> int | None:
+        self._check_feed(feed)
+        if not 0 <= provider < self._n_providers:
+            raise IndexError("Provider index out of range.")
+        i = feed * self._n_providers + provider
+        return self._values[i] if self._mask[i] else None
+
+    def feed_values(self, feed: int) -> list[int | None]:
+        return [
+            v if present else None
+            for v, present in zip(self.column(feed), self.mask(feed), strict=True)
+        ]
+
+    def provider_values(self, provider: int) -> list[int | None]:
+        return [self.value(provider, feed) for feed in range(self._n_feeds)]
+
+    def votes(self, feed: int, weights: Sequence[int]) -> list[FtsoVote]:
+        # Votes of providers that revealed a value for the feed, in provider
+        # order, ready for calculate_median
+        if len(weights) != self._n_providers:
+            raise ValueError("Weights must have one entry per provider.")
+        return [
+            FtsoVote(v, w)
+            for v, present, w in zip(
+                self.column(feed), self.mask(feed), weights, strict=True
+            )
+            if present
+        ]
+
+    def feed_votes(self, feed: int, weights: Sequence[int]) -> FtsoVotes:
+        # Same as votes, as array backed FtsoVotes
+        if len(weights) != self._n_providers:
+            raise ValueError("Weights must have one entry per provider.")
+        mask = self.mask(feed)
+        return FtsoVotes(
+            (v for v, present in zip(self.column(feed), mask, strict=True) if present),
+            (w for w, present in zip(weights, mask, strict=True) if present),
+        )
+
+    def medians(self, weights: Sequence[int]) -> list[FtsoQuartiles | None]:
+        return calculate_medians(
+            (self.feed_values(feed) for feed in range(self._n_feeds)), weights
+        )
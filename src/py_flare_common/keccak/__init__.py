@@ -0,0 +1,15 @@
+from .backend import (
+    available_backends,
+    get_backend,
+    keccak,
+    keccak_many,
+    set_backend,
+)
+
+__all__ = [
+    "available_backends",
+    "get_backend",
+    "keccak",
+    "keccak_many",
+    "set_backend",
+]
@@ -0,0 +1,91 @@
+from collections.abc import Callable, Iterable
+from importlib import import_module
+
+__all__ = [
+    "available_backends",
+    "get_backend",
+    "keccak",
+    "keccak_many",
+    "set_backend",
+]
+
+Buffer = bytes | bytearray | memoryview
+KeccakFunction = Callable[[Buffer], bytes]
+
+
+def _pysha3(module: str) -> KeccakFunction:
+    keccak_256 = import_module(module).keccak_256
+
+    def keccak(data: Buffer) -> bytes:
+        return keccak_256(data).digest()
+
+    return keccak
+
+
+def _pycryptodome(module: str) -> KeccakFunction:
+    new = import_module(f"{module}.Hash.keccak").new
+
+    def keccak(data: Buffer) -> bytes:
+        return new(digest_bits=256, data=data).digest()
+
+    return keccak
+
+
+def _eth_hash() -> KeccakFunction:
+    eth_keccak = import_module("eth_hash.auto").keccak
+
+    def keccak(data: Buffer) -> bytes:
+        return eth_keccak(data if isinstance(data, bytes | bytearray) else bytes(data))
+
+    return keccak
+
+
+# Ordered from the fastest to the slowest, the `sha3` module is installed by
+# both pysha3 and safe-pysha3
+_BACKENDS: dict[str, Callable[[], KeccakFunction]] = {
+    "pysha3": lambda: _pysha3("sha3"),
+    "pycryptodomex": lambda: _pycryptodome("Cryptodome"),
+    "pycryptodome": lambda: _pycryptodome("Crypto"),
+    "eth-hash": _eth_hash,
+}
+
+_loaded: dict[str, KeccakFunction] = {}
+
+
+def _load(name: str) -> KeccakFunction | None:
+    if name not in _loaded:
+        try:
+            _loaded[name] = _BACKENDS[name]()
+        except ImportError:
+            return None
+    return _loaded[name]
+
+
+def available_backends() -> list[str]:
+    return [name for name in _BACKENDS if _load(name) is not None]
+
+
+_backend_name = available_backends()[0]
+_keccak = _loaded[_backend_name]
+
+
+def get_backend() -> str:
+    return _backend_name
+
+
+def set_backend(name: str) -> None:
+    global _backend_name, _keccak
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown keccak backend {name}.")
+    keccak = _load(name)
+    if keccak is None:
+        raise ValueError(f"Keccak backend {name} is not installed.")
+    _backend_name, _keccak = name, keccak
+
+
+def keccak(data: Buffer) -> bytes:
+    return _keccak(data)
+
+
+def keccak_many(items: Iterable[Buffer]) -> list[bytes]:
+    return list(map(_keccak, items))
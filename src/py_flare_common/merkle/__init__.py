@@ -1,3 +1,24 @@
-from .tree import MerkleTree, single_hash
+from .incremental import IncrementalMerkleTree
+from .multiproof import MultiProof, get_multiproof, verify_multiproof
+from .storage import dump_tree, load_tree
+from .tree import (
+    BytesMerkleTree,
+    MerkleTree,
+    single_hash,
+    verify_with_merkle_proof,
+    verify_with_merkle_proofs,
+)
 
-__all__ = ["MerkleTree", "single_hash"]
+__all__ = [
+    "BytesMerkleTree",
+    "IncrementalMerkleTree",
+    "MerkleTree",
+    "MultiProof",
+    "dump_tree",
+    "get_multiproof",
+    "load_tree",
+    "single_hash",
+    "verify_with_merkle_proof",
+    "verify_multiproof",
+    "verify_with_merkle_proofs",
+]
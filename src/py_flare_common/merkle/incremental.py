@@ -0,0 +1,110 @@
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from .tree import BytesMerkleTree, to_bytes32
+
+__all__ = ["IncrementalMerkleTree"]
+
+
+class IncrementalMerkleTree(BytesMerkleTree):
+    """Merkle tree that accepts new leaves after it was built.
+
+    Leaves are kept sorted and deduplicated, so the tree always matches
+    `MerkleTree` over all inserted values. Inserts only update the leaf list,
+    nodes are rebuilt the next time the tree is read, so any number of
+    inserts between two reads costs a single rebuild. Because the shape of
+    the tree depends on the number of leaves, an insert can move every node
+    and the rebuild hashes the whole tree again. Initial hashing of leaves is
+    not supported.
+    """
+
+    def __init__(self, values: Iterable[str | bytes] = ()):
+        self._leaves: list[bytes] = []
+        self._buffer = bytearray()
+        self._dirty = False
+        super().__init__(values)
+
+    @classmethod
+    def from_nodes(
+        cls, nodes: bytearray | memoryview, initial_hash: bool = False
+    ) -> "IncrementalMerkleTree":
+        if initial_hash:
+            raise ValueError("IncrementalMerkleTree does not support initial_hash")
+
+        count, rest = divmod(len(nodes), 32)
+        if rest or count % 2 == 0 and count != 0:
+            raise ValueError("Invalid Merkle tree node buffer")
+
+        tree = cls()
+        n = (count + 1) // 2
+        tree._leaves = [
+            bytes(nodes[32 * i : 32 * (i + 1)]) for i in range(n - 1, 2 * n - 1)
+        ]
+        tree._buffer = bytearray(nodes)
+        tree._index = tree._leaf_index()
+        return tree
+
+    @classmethod
+    def from_sorted_iter(
+        cls,
+        values: Iterable[str | bytes],
+        count: int | None = None,
+        initial_hash: bool = False,
+        workers: int = 1,
+        use_threads: bool = False,
+    ) -> "IncrementalMerkleTree":
+        if initial_hash:
+            raise ValueError("IncrementalMerkleTree does not support initial_hash")
+
+        leaves: list[bytes] = []
+        for value in values:
+            leaf = to_bytes32(value)
+            if leaves and leaf <= leaves[-1]:
+                if leaf == leaves[-1]:
+                    continue
+                raise ValueError("Values are not sorted")
+            leaves.append(leaf)
+
+        tree = cls()
+        tree.workers = workers
+        tree.use_threads = use_threads
+        tree._leaves = leaves
+        tree._dirty = bool(leaves)
+        return tree
+
+    @property
+    def _nodes(self) -> bytearray:
+        if self._dirty:
+            self._rebuild()
+        return self._buffer
+
+    @_nodes.setter
+    def _nodes(self, nodes: bytearray):
+        self._buffer = nodes
+
+    def build(self, values: Iterable[str | bytes]):
+        self._leaves = []
+        self._buffer = bytearray()
+        self._dirty = False
+        self.insert(values)
+
+    def insert(self, values: Iterable[str | bytes]) -> int:
+        leaves = self._leaves
+        inserted = 0
+        for value in values:
+            leaf = to_bytes32(value)
+            i = bisect_left(leaves, leaf)
+            if i == len(leaves) or leaves[i] != leaf:
+                leaves.insert(i, leaf)
+                inserted += 1
+
+        self._dirty = self._dirty or inserted > 0
+        return inserted
+
+    def _rebuild(self):
+        n = len(self._leaves)
+        nodes = bytearray(32 * max(n - 1, 0))
+        nodes += b"".join(self._leaves)
+
+        self._dirty = False
+        self._build_nodes(nodes)
@@ -0,0 +1,94 @@
+from collections import deque
+from collections.abc import Iterable
+
+from attrs import frozen
+
+from .tree import BytesMerkleTree, MerkleTree, sorted_hash_pair_bytes, to_bytes32
+
+__all__ = ["MultiProof", "get_multiproof", "process_multiproof", "verify_multiproof"]
+
+
+# Same format as OpenZeppelin's MerkleProof.multiProofVerify, leaves are
+# ordered from the last tree position to the first
+@frozen
+class MultiProof:
+    leaves: list[str]
+    proof: list[str]
+    proof_flags: list[bool]
+
+
+def get_multiproof(
+    tree: MerkleTree | BytesMerkleTree, targets: Iterable[str | bytes]
+) -> MultiProof | None:
+    indices = tree._leaf_indices(list(targets))
+    if any(i is None for i in indices):
+        return None
+    if tree.hash_count == 0:
+        return None
+
+    offset = len(tree) - tree.hash_count
+    positions = sorted({offset + i for i in indices if i is not None}, reverse=True)
+
+    queue = deque(positions)
+    proof = []
+    proof_flags = []
+    while queue and queue[0] > 0:
+        pos = queue.popleft()
+        sibling = pos + 2 * (pos % 2) - 1
+        if queue and queue[0] == sibling:
+            proof_flags.append(True)
+            queue.popleft()
+        else:
+            proof_flags.append(False)
+            proof.append(tree._node_hex(sibling))
+        queue.append((pos - 1) // 2)
+
+    if not positions:
+        proof.append(tree._node_hex(0))
+
+    return MultiProof(
+        leaves=[tree._node_hex(pos) for pos in positions],
+        proof=proof,
+        proof_flags=proof_flags,
+    )
+
+
+def process_multiproof(multiproof: MultiProof) -> bytes:
+    leaves = [to_bytes32(leaf) for leaf in multiproof.leaves]
+    proof = [to_bytes32(node) for node in multiproof.proof]
+    proof_flags = multiproof.proof_flags
+
+    if len(leaves) + len(proof) != len(proof_flags) + 1:
+        raise ValueError("Invalid multiproof")
+
+    queue = deque(leaves)
+    proof_pos = 0
+    for flag in proof_flags:
+        if not queue:
+            raise ValueError("Invalid multiproof")
+        a = queue.popleft()
+        if flag:
+            if not queue:
+                raise ValueError("Invalid multiproof")
+            b = queue.popleft()
+        else:
+            b = proof[proof_pos]
+            proof_pos += 1
+        queue.append(sorted_hash_pair_bytes(a + b))
+
+    if proof_flags:
+        if proof_pos != len(proof) or len(queue) != 1:
+            raise ValueError("Invalid multiproof")
+        return queue.pop()
+    if leaves:
+        return leaves[0]
+    return proof[0]
+
+
+def verify_multiproof(multiproof: MultiProof, root: str | bytes) -> bool:
+    if not root:
+        return False
+    try:
+        return process_multiproof(multiproof) == to_bytes32(root)
+    except ValueError:
+        return False
@@ -0,0 +1,61 @@
+import mmap
+import os
+import struct
+
+from .tree import BytesMerkleTree, MerkleTree
+
+__all__ = ["dump_tree", "load_tree"]
+
+# magic, version, flags, node count. The header is followed by the node
+# array and, for trees with initial hashing (since version 2), by the
+# positions of the leaves sorted by hash as big endian uint64, so lookups
+# bisect the mapped file instead of building an index in memory
+_HEADER = struct.Struct(">4sBB2xQ")
+_MAGIC = b"FMKT"
+_VERSION = 2
+_FLAG_INITIAL_HASH = 1
+
+
+def dump_tree(tree: MerkleTree | BytesMerkleTree, path: str | os.PathLike) -> None:
+    flags = _FLAG_INITIAL_HASH if tree.initial_hash else 0
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, flags, len(tree)))
+        if isinstance(tree, BytesMerkleTree):
+            f.write(tree._nodes)
+            index = tree._index
+        else:
+            nodes = b"".join(tree._node_bytes(i) for i in range(len(tree)))
+            f.write(nodes)
+            index = BytesMerkleTree.from_nodes(
+                memoryview(nodes), initial_hash=tree.initial_hash
+            )._index
+        if index is not None:
+            f.write(index)
+
+
+def load_tree(path: str | os.PathLike, use_mmap: bool = True) -> BytesMerkleTree:
+    with open(path, "rb") as f:
+        if use_mmap:
+            buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            buffer = memoryview(f.read())
+
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Invalid Merkle tree file")
+
+    magic, version, flags, count = _HEADER.unpack_from(buffer)
+    if magic != _MAGIC or version not in (1, _VERSION):
+        raise ValueError("Invalid Merkle tree file")
+
+    initial_hash = bool(flags & _FLAG_INITIAL_HASH)
+    end = _HEADER.size + 32 * count
+    # Version 1 files have no leaf index, it is built in memory on load
+    index_size = 8 * ((count + 1) // 2) if initial_hash and version > 1 else 0
+    if len(buffer) != end + index_size:
+        raise ValueError("Invalid Merkle tree file size")
+
+    return BytesMerkleTree.from_nodes(
+        buffer[_HEADER.size : end],
+        initial_hash=initial_hash,
+        index=buffer[end:] if index_size else None,
+    )
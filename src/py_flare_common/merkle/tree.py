@@ -1,13 +1,26 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from typing import Literal, overload
+
 from eth_abi.abi import encode
-from eth_hash.auto import keccak
 
 from .._hexstr.hexstr import is_hex_str, prefix_0x, un_prefix_0x
+from ..keccak import keccak
 
-__all__ = ["single_hash", "MerkleTree"]
+__all__ = [
+    "single_hash",
+    "MerkleTree",
+    "BytesMerkleTree",
+    "verify_with_merkle_proof",
+    "verify_with_merkle_proofs",
+]
 
 
-def single_hash(value: str | bytes) -> str:
+def single_hash(value: str | bytes | bytearray | memoryview) -> str:
     if isinstance(value, str):
+        value = un_prefix_0x(value)
         if not is_hex_str(value):
             raise ValueError("Invalid hex string")
         value = bytes.fromhex(value)
@@ -34,9 +47,109 @@ def sorted_hash_pair(x: str, y: str) -> str:
     return single_hash(encoded)
 
 
-class MerkleTree:
+# Function to convert a leaf to 32 bytes, left padded like `to_hex`
+def to_bytes32(value: str | bytes | bytearray | memoryview) -> bytes:
+    if isinstance(value, str):
+        try:
+            value = bytes.fromhex(un_prefix_0x(value).rjust(64, "0"))
+        except ValueError as e:
+            raise ValueError("Invalid hex string") from e
+    if len(value) > 32:
+        raise ValueError("Value is longer than 32 bytes")
+    return bytes(value).rjust(32, b"\x00")
+
+
+# Bytes counterpart of `sorted_hash_pair`, the 64 byte `pair` holds both nodes
+def sorted_hash_pair_bytes(pair: bytes | bytearray) -> bytes:
+    if pair[:32] > pair[32:]:
+        pair = pair[32:] + pair[:32]
+    return keccak(pair)
+
+
+class _MerkleProofs(ABC):
+    @property
+    @abstractmethod
+    def hash_count(self) -> int: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def _node_hex(self, i: int) -> str: ...
+
+    @abstractmethod
+    def _node_bytes(self, i: int) -> bytes: ...
+
+    @abstractmethod
+    def _leaf_indices(self, targets: list[str | bytes]) -> list[int | None]: ...
+
+    @overload
+    def get_proofs(
+        self, targets: Iterable[str | bytes], as_bytes: Literal[False] = False
+    ) -> list[list[str] | None]: ...
+
+    @overload
+    def get_proofs(
+        self, targets: Iterable[str | bytes], as_bytes: Literal[True]
+    ) -> list[list[bytes] | None]: ...
+
+    def get_proofs(self, targets, as_bytes=False):
+        return self._proofs(self._leaf_indices(list(targets)), as_bytes)
+
+    @overload
+    def all_proofs(self, as_bytes: Literal[False] = False) -> list[list[str]]: ...
+
+    @overload
+    def all_proofs(self, as_bytes: Literal[True]) -> list[list[bytes]]: ...
+
+    def all_proofs(self, as_bytes=False):
+        # Proofs are in the order of sorted_hashes
+        return self._proofs(range(self.hash_count), as_bytes)
+
+    def _proofs(self, indices, as_bytes):
+        node = self._node_bytes if as_bytes else self._node_hex
+        offset = len(self) - self.hash_count
+
+        # Proof of each visited node, siblings on the upper levels are shared
+        paths: dict[int, list] = {0: []}
+        proofs = []
+        for index in indices:
+            if index is None:
+                proofs.append(None)
+                continue
+
+            pos = offset + index
+            stack = []
+            while pos not in paths:
+                stack.append(pos)
+                pos = (pos - 1) // 2
+            while stack:
+                child = stack.pop()
+                paths[child] = [node(child + 2 * (child % 2) - 1), *paths[pos]]
+                pos = child
+            proofs.append(paths[offset + index][:])
+        return proofs
+
+
+# Levels smaller than this are not worth sending to a worker pool
+_PARALLEL_MIN_BYTES = 2**16
+
+
+def _hash_leaves(leaves: bytes) -> bytes:
+    return b"".join(keccak(leaves[i : i + 32]) for i in range(0, len(leaves), 32))
+
+
+def _hash_pairs(children: bytes) -> bytes:
+    return b"".join(
+        sorted_hash_pair_bytes(children[i : i + 64])
+        for i in range(0, len(children), 64)
+    )
+
+
+class MerkleTree(_MerkleProofs):
     def __init__(self, values: list[str], initial_hash: bool = False):
         self._tree: list[str] = []
+        self._index: dict[str, int] = {}
         self.initial_hash = initial_hash
         self.build(values)
 
@@ -83,6 +196,7 @@ class MerkleTree:
             tree[i] = sorted_hash_pair(tree[2 * i + 1], tree[2 * i + 2])
             i -= 1
         self._tree = tree
+        self._index = {h: i for i, h in enumerate(hashes)}
 
     def get_hash(self, i: int) -> str | None:
         if self.hash_count == 0 or not (0 <= i < self.hash_count):
@@ -91,29 +205,296 @@ class MerkleTree:
         return self._tree[pos]
 
     def binary_search(self, target: str) -> int | None:
+        # Leaf lookup goes through the index built in `build`
+        return self._index.get(target)
+
+    def contains(self, leaf: str) -> bool:
+        return to_hex(leaf, 32) in self._index
+
+    def get_proof(self, target: str) -> list[str] | None:
+        target = to_hex(target, 32)
+        index = self.binary_search(target)
+        if index is None:
+            return None
+
+        proof = []
+        pos = len(self._tree) - self.hash_count + index
+        while pos > 0:
+            sibling = pos + 2 * (pos % 2) - 1
+            proof.append(self._tree[sibling])
+            pos = self.parent(pos)
+        return proof
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def _node_hex(self, i: int) -> str:
+        return self._tree[i]
+
+    def _node_bytes(self, i: int) -> bytes:
+        return bytes.fromhex(un_prefix_0x(self._tree[i]))
+
+    def _leaf_indices(self, targets: list[str | bytes]) -> list[int | None]:
+        return [
+            self._index.get(to_hex(t if isinstance(t, str) else t.hex(), 32))
+            for t in targets
+        ]
+
+
+class BytesMerkleTree(_MerkleProofs):
+    """Merkle tree with the same layout and output as `MerkleTree`.
+
+    Nodes are kept as 32 byte values in one contiguous buffer, hex strings
+    are only produced when the tree is read.
+
+    With `workers` > 1 the leaf hashing and the large levels of the tree are
+    split between a process pool, or a thread pool if `use_threads` is set.
+    The result is identical to the serial build.
+    """
+
+    def __init__(
+        self,
+        values: Iterable[str | bytes],
+        initial_hash: bool = False,
+        workers: int = 1,
+        use_threads: bool = False,
+    ):
+        self._nodes: bytearray | memoryview = bytearray()
+        # Positions of the hashed leaves in sorted order, 8 bytes each
+        self._index: bytes | memoryview | None = None
+        self.initial_hash = initial_hash
+        self.workers = workers
+        self.use_threads = use_threads
+        self.build(values)
+
+    @classmethod
+    def from_nodes(
+        cls,
+        nodes: bytearray | memoryview,
+        initial_hash: bool = False,
+        index: bytes | memoryview | None = None,
+    ) -> "BytesMerkleTree":
+        # Wraps an already built node buffer, e.g. a memory mapped file. With
+        # initial_hash the sorted leaf order can be passed as `index` (as
+        # written by dump_tree), otherwise it is computed.
+        count, rest = divmod(len(nodes), 32)
+        if rest or count % 2 == 0 and count != 0:
+            raise ValueError("Invalid Merkle tree node buffer")
+
+        tree = cls([], initial_hash=initial_hash)
+        tree._nodes = nodes
+        if index is None:
+            tree._index = tree._leaf_index()
+        elif not initial_hash or len(index) != 8 * tree.hash_count:
+            raise ValueError("Invalid Merkle tree leaf index")
+        else:
+            tree._index = index
+        return tree
+
+    @classmethod
+    def from_sorted_iter(
+        cls,
+        values: Iterable[str | bytes],
+        count: int | None = None,
+        initial_hash: bool = False,
+        workers: int = 1,
+        use_threads: bool = False,
+    ) -> "BytesMerkleTree":
+        # Consumes sorted values one by one, duplicates are skipped on the fly.
+        # With `count` (upper bound of leaves) the node buffer is allocated once.
+        internal = max((count or 0) - 1, 0)
+        nodes = bytearray(32 * (internal + (count or 0)))
+
+        n = 0
+        last = b""
+        for value in values:
+            leaf = to_bytes32(value)
+            if n and leaf <= last:
+                if leaf == last:
+                    continue
+                raise ValueError("Values are not sorted")
+            pos = 32 * (internal + n)
+            if pos < len(nodes):
+                nodes[pos : pos + 32] = leaf
+            else:
+                nodes += leaf
+            last = leaf
+            n += 1
+
+        # Resize the internal part to n - 1 nodes and drop unused leaf slots
+        missing = max(n - 1, 0) - internal
+        if missing > 0:
+            nodes[0:0] = bytes(32 * missing)
+        elif missing < 0:
+            del nodes[: -32 * missing]
+        del nodes[32 * max(2 * n - 1, 0) :]
+
+        tree = cls([], initial_hash, workers, use_threads)
+        tree._build_nodes(nodes)
+        return tree
+
+    @property
+    def root(self) -> str | None:
+        return prefix_0x(self._nodes[:32].hex()) if self._nodes else None
+
+    @property
+    def root_bytes(self) -> bytes | None:
+        return bytes(self._nodes[:32]) if self._nodes else None
+
+    @property
+    def root_bigint(self) -> int:
+        return int.from_bytes(self._nodes[:32]) if self._nodes else 0
+
+    @property
+    def tree(self) -> list[str]:
+        return [prefix_0x(self._node(i).hex()) for i in range(len(self))]
+
+    @property
+    def hash_count(self) -> int:
+        return (len(self) + 1) // 2
+
+    @property
+    def sorted_hashes(self) -> list[str]:
+        return [prefix_0x(self._node(i).hex()) for i in range(self._offset, len(self))]
+
+    @property
+    def _offset(self) -> int:
+        return len(self) - self.hash_count
+
+    def __len__(self) -> int:
+        return len(self._nodes) // 32
+
+    def _node(self, i: int) -> bytes:
+        return bytes(self._nodes[32 * i : 32 * (i + 1)])
+
+    def parent(self, i: int) -> int:
+        return (i - 1) // 2
+
+    def build(self, values: Iterable[str | bytes]):
+        hashes = sorted({to_bytes32(v) for v in values})
+        n = len(hashes)
+
+        nodes = bytearray(32 * max(2 * n - 1, 0))
+        for i, h in enumerate(hashes, n - 1):
+            nodes[32 * i : 32 * (i + 1)] = h
+        del hashes
+
+        self._build_nodes(nodes)
+
+    def _build_nodes(self, nodes: bytearray):
+        # Fills in the internal nodes of a buffer that already holds the leaves
+        n = (len(nodes) // 32 + 1) // 2
+
+        with self._executor() as executor:
+            if self.initial_hash:
+                if executor is None or 32 * n < _PARALLEL_MIN_BYTES:
+                    for i in range(n - 1, 2 * n - 1):
+                        nodes[32 * i : 32 * (i + 1)] = keccak(
+                            nodes[32 * i : 32 * (i + 1)]
+                        )
+                else:
+                    leaves = bytes(nodes[32 * (n - 1) :])
+                    nodes[32 * (n - 1) :] = self._map(
+                        executor, _hash_leaves, leaves, 32
+                    )
+
+            # Nodes on one level only depend on the level below, so each level
+            # is hashed in one batch that can be split between workers
+            for depth in range((n - 1).bit_length() - 1 if n > 1 else -1, -1, -1):
+                a = 2**depth - 1
+                b = min(2 ** (depth + 1) - 1, n - 1)
+                if executor is None or 64 * (b - a) < _PARALLEL_MIN_BYTES:
+                    for i in range(b - 1, a - 1, -1):
+                        c = 32 * (2 * i + 1)
+                        nodes[32 * i : 32 * (i + 1)] = sorted_hash_pair_bytes(
+                            nodes[c : c + 64]
+                        )
+                else:
+                    children = bytes(nodes[32 * (2 * a + 1) : 32 * (2 * b + 1)])
+                    nodes[32 * a : 32 * b] = self._map(
+                        executor, _hash_pairs, children, 64
+                    )
+        self._nodes = nodes
+        self._index = self._leaf_index()
+
+    def _leaf_index(self) -> bytes | None:
+        # Hashed leaves are no longer sorted, they are bisected through the
+        # list of their positions sorted by hash
+        if not self.initial_hash:
+            return None
+        offset = self._offset
+        order = sorted(range(self.hash_count), key=lambda i: self._node(offset + i))
+        return b"".join(i.to_bytes(8) for i in order)
+
+    def _sorted_leaf(self, k: int) -> int:
+        # Position of the k-th smallest leaf
+        if self._index is None:
+            return k
+        return int.from_bytes(self._index[8 * k : 8 * (k + 1)])
+
+    def _executor(self) -> AbstractContextManager[Executor | None]:
+        if self.workers <= 1:
+            return nullcontext()
+        if self.use_threads:
+            return ThreadPoolExecutor(self.workers)
+        return ProcessPoolExecutor(self.workers)
+
+    def _map(
+        self,
+        executor: Executor,
+        fn: Callable[[bytes], bytes],
+        data: bytes,
+        size: int,
+    ) -> bytes:
+        step = -(-len(data) // size // self.workers) * size
+        chunks = [data[i : i + step] for i in range(0, len(data), step)]
+        return b"".join(executor.map(fn, chunks))
+
+    def get_hash(self, i: int) -> str | None:
+        if self.hash_count == 0 or not (0 <= i < self.hash_count):
+            return None
+        return prefix_0x(self._node(self._offset + i).hex())
+
+    def binary_search(self, target: str | bytes) -> int | None:
+        target = to_bytes32(target)
+        if self.hash_count == 0:
+            return None
+        offset = self._offset
         low, high = 0, self.hash_count
         while high - low > 1:
             mid = (low + high) // 2
-            if target < self.sorted_hashes[mid]:
+            if target < self._node(offset + self._sorted_leaf(mid)):
                 high = mid
             else:
                 low = mid
-        return low if self.sorted_hashes[low] == target else None
+        i = self._sorted_leaf(low)
+        return i if self._node(offset + i) == target else None
 
-    def get_proof(self, target: str) -> list[str] | None:
-        target = to_hex(target, 32)
+    def contains(self, leaf: str | bytes) -> bool:
+        return self.binary_search(leaf) is not None
+
+    def get_proof(self, target: str | bytes) -> list[str] | None:
         index = self.binary_search(target)
         if index is None:
             return None
 
         proof = []
-        pos = len(self._tree) - self.hash_count + index
+        pos = self._offset + index
         while pos > 0:
             sibling = pos + 2 * (pos % 2) - 1
-            proof.append(self._tree[sibling])
+            proof.append(prefix_0x(self._node(sibling).hex()))
             pos = self.parent(pos)
         return proof
 
+    def _node_hex(self, i: int) -> str:
+        return prefix_0x(self._node(i).hex())
+
+    def _node_bytes(self, i: int) -> bytes:
+        return self._node(i)
+
+    def _leaf_indices(self, targets: list[str | bytes]) -> list[int | None]:
+        return [self.binary_search(t) for t in targets]
+
 
 def verify_with_merkle_proof(leaf: str, proof: list[str], root: str) -> bool:
     if not leaf or not proof or not root:
@@ -122,3 +503,37 @@ def verify_with_merkle_proof(leaf: str, proof: list[str], root: str) -> bool:
     for sibling_hash in proof:
         current_hash = sorted_hash_pair(current_hash, sibling_hash)
     return current_hash == root
+
+
+def verify_with_merkle_proofs(
+    items: Iterable[tuple[str | bytes, Sequence[str | bytes]]], root: str | bytes
+) -> list[bool]:
+    # Proofs against the same root share their upper nodes, so the parent of
+    # every hashed pair is kept for the following proofs
+    root = to_bytes32(root) if root else b""
+    parents: dict[bytes, bytes] = {}
+    results = []
+    for leaf, proof in items:
+        if not leaf or not proof or not root:
+            results.append(False)
+            continue
+
+        # A malformed leaf or sibling only fails its own item
+        try:
+            current_hash = to_bytes32(leaf)
+            for sibling_hash in proof:
+                sibling_hash = to_bytes32(sibling_hash)
+                if current_hash <= sibling_hash:
+                    pair = current_hash + sibling_hash
+                else:
+                    pair = sibling_hash + current_hash
+
+                parent = parents.get(pair)
+                if parent is None:
+                    parent = parents[pair] = keccak(pair)
+                current_hash = parent
+        except ValueError:
+            results.append(False)
+            continue
+        results.append(current_hash == root)
+    return results
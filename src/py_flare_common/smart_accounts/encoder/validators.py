@@ -7,9 +7,11 @@ from eth_utils.address import to_checksum_address
 from py_flare_common.smart_accounts.encoder import exceptions
 
 
-def clean_str_or_bytes(s: str | bytes) -> bytes:
-    if isinstance(s, bytes):
-        return s
+def clean_str_or_bytes(s: str | bytes | bytearray | memoryview) -> bytes:
+    if isinstance(s, bytes | bytearray | memoryview):
+        return bytes(s)
+    if not isinstance(s, str):
+        raise exceptions.DecodeError(f"expected hex string or bytes, got {type(s)}")
 
     try:
         return bytes.fromhex(s.removeprefix("0x"))
@@ -0,0 +1,158 @@
+import random
+import time
+
+import pytest
+
+from py_flare_common.fdc.consensus import consensus_bitvector, weighted_support
+from py_flare_common.fsp.messaging.types import FdcSubmit2, PackedBitvector
+
+
+def bv(bits: str) -> PackedBitvector:
+    return PackedBitvector.from_list([b == "1" for b in bits])
+
+
+@pytest.mark.parametrize("n_requests", [1, 7, 8, 9, 100])
+@pytest.mark.parametrize("n_providers", [1, 5, 50])
+def test_weighted_support(n_requests, n_providers):
+    rng = random.Random(n_requests * 1000 + n_providers)
+    votes = [
+        [rng.random() < 0.7 for _ in range(n_requests)] for _ in range(n_providers)
+    ]
+    weights = [rng.randrange(0, 2**20) for _ in range(n_providers)]
+
+    expected = [
+        sum(w for v, w in zip(votes, weights, strict=True) if v[i])
+        for i in range(n_requests)
+    ]
+    submits = [FdcSubmit2(n_requests, v) for v in votes]
+    assert weighted_support(submits, weights) == expected
+    assert (
+        weighted_support([PackedBitvector.from_list(v) for v in votes], weights)
+        == expected
+    )
+
+
+def test_weighted_support_empty():
+    assert weighted_support([], []) == []
+    assert weighted_support([bv("")], [5]) == []
+
+
+def test_consensus_bitvector():
+    votes = [bv("1110"), bv("1101"), bv("1100"), bv("0111")]
+    weights = [30, 30, 20, 20]
+
+    consensus = consensus_bitvector(votes, weights)
+    assert consensus is not None
+    assert consensus.bitvector == bv("1100")
+    assert consensus.support == 80
+    assert consensus.total_weight == 100
+
+
+def test_consensus_bitvector_prefers_more_requests():
+    votes = [bv("1111"), bv("1111"), bv("1000")]
+    weights = [40, 30, 30]
+
+    consensus = consensus_bitvector(votes, weights)
+    assert consensus is not None
+    assert consensus.bitvector == bv("1111")
+    assert consensus.support == 70
+
+
+def test_consensus_bitvector_intersection():
+    # The consensus is the overlap of votes, not submitted by anyone
+    consensus = consensus_bitvector([bv("1110"), bv("1101")], [50, 50])
+    assert consensus is not None
+    assert consensus.bitvector == bv("1100")
+    assert consensus.support == 100
+
+    votes = [bv("11100"), bv("11010"), bv("00111")]
+    consensus = consensus_bitvector(votes, [30, 30, 40])
+    assert consensus is not None
+    assert consensus.bitvector == bv("11000")
+    assert consensus.support == 60
+
+    # The greedy pass alone finds it, and it counts against max_steps too
+    assert consensus_bitvector(votes, [30, 30, 40], max_steps=3) == consensus
+    assert consensus_bitvector(votes, [30, 30, 40], max_steps=0) is None
+
+
+def test_consensus_bitvector_brute_force():
+    rng = random.Random(0)
+    for _ in range(200):
+        n_requests = rng.randrange(1, 7)
+        n_providers = rng.randrange(1, 7)
+        votes = [
+            [rng.random() < 0.7 for _ in range(n_requests)] for _ in range(n_providers)
+        ]
+        weights = [rng.randrange(0, 10) for _ in range(n_providers)]
+        values = [PackedBitvector.from_list(v).value for v in votes]
+
+        # Every candidate bitvector, the empty one only if submitted
+        expected = None
+        for candidate in range(1 << n_requests):
+            if candidate == 0 and 0 not in values:
+                continue
+            support = sum(
+                w
+                for v, w in zip(values, weights, strict=True)
+                if v & candidate == candidate
+            )
+            key = (candidate.bit_count() * support, support, candidate)
+            if 2 * support > sum(weights) and (expected is None or key > expected):
+                expected = key
+
+        consensus = consensus_bitvector(
+            [PackedBitvector.from_list(v) for v in votes], weights
+        )
+        if expected is None:
+            assert consensus is None
+        else:
+            assert consensus is not None
+            assert consensus.bitvector.value == expected[2]
+            assert consensus.support == expected[1]
+
+
+def test_consensus_bitvector_large():
+    # Near unanimous round with many requests, every provider misses a few
+    rng = random.Random(0)
+    n_requests = 2000
+    votes = []
+    for _ in range(100):
+        bits = [True] * n_requests
+        for _ in range(rng.randrange(0, 5)):
+            bits[rng.randrange(n_requests)] = False
+        votes.append(PackedBitvector.from_list(bits))
+    weights = [rng.randrange(1, 1000) for _ in range(100)]
+
+    start = time.perf_counter()
+    consensus = consensus_bitvector(votes, weights)
+    assert time.perf_counter() - start < 10
+    assert consensus is not None
+    assert 2 * consensus.support > sum(weights)
+    assert consensus.bitvector.value.bit_count() > 1800
+
+
+def test_consensus_bitvector_no_majority():
+    votes = [bv("10"), bv("01")]
+    assert consensus_bitvector(votes, [50, 50]) is None
+    assert consensus_bitvector([bv("11")], [40], total_weight=100) is None
+    assert consensus_bitvector([], []) is None
+
+
+def test_consensus_bitvector_deterministic():
+    votes = [bv("1100"), bv("0011"), bv("1111")]
+    weights = [10, 10, 10]
+
+    consensus = consensus_bitvector(votes, weights)
+    assert consensus is not None
+    assert consensus.bitvector == bv("1100")
+    assert consensus_bitvector(votes[::-1], weights) == consensus
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        weighted_support([bv("1")], [1, 2])
+    with pytest.raises(ValueError):
+        weighted_support([bv("1"), bv("11")], [1, 2])
+    with pytest.raises(ValueError):
+        consensus_bitvector([bv("1")], [-1])
@@ -0,0 +1,70 @@
+import random
+
+from py_flare_common.ftso.incremental import IncrementalMedian
+from py_flare_common.ftso.median import FtsoQuartiles, FtsoVote, calculate_median
+
+
+def test_empty():
+    median = IncrementalMedian()
+    assert len(median) == 0
+    assert median.quartiles() is None
+    assert median.median() is None
+
+    median.add(FtsoVote(5, 0))
+    assert median.quartiles() is None
+
+
+def test_add():
+    median = IncrementalMedian()
+    median.add(FtsoVote(7, 20))
+    assert median.quartiles() == FtsoQuartiles(7, 7, 7)
+
+    median.add(FtsoVote(9, 20))
+    assert median.quartiles() == FtsoQuartiles(8, 7, 9)
+
+    median.add(FtsoVote(1, 100))
+    assert median.quartiles() == FtsoQuartiles(1, 1, 7)
+    assert len(median) == 3
+    assert median.total_weight == 140
+
+
+def test_matches_calculate_median():
+    rng = random.Random(0)
+    for _ in range(100):
+        votes = [
+            FtsoVote(rng.randint(-20, 20), rng.choice([0, 1, 2, 3, 50]))
+            for _ in range(rng.randint(1, 40))
+        ]
+        median = IncrementalMedian()
+        for i, vote in enumerate(votes):
+            median.add(vote)
+            if sum(v.weight for v in votes[: i + 1]) == 0:
+                assert median.median() is None
+                continue
+
+            assert median.median() == calculate_median(votes[: i + 1].copy())
+
+
+def test_init_with_votes():
+    votes = [FtsoVote(3, 1), FtsoVote(1, 1), FtsoVote(3, 2), FtsoVote(2, 1)]
+    median = IncrementalMedian(votes)
+    assert median.sorted_votes() == [
+        FtsoVote(1, 1),
+        FtsoVote(2, 1),
+        FtsoVote(3, 1),
+        FtsoVote(3, 2),
+    ]
+    assert median.median() == calculate_median(votes.copy())
+
+
+def test_median_cached_until_add():
+    median = IncrementalMedian([FtsoVote(3, 1), FtsoVote(1, 1)])
+    first = median.median()
+    assert first is not None
+    assert median.median() is first
+
+    median.add(FtsoVote(2, 1))
+    second = median.median()
+    assert second is not first
+    assert first.sorted_votes == [FtsoVote(1, 1), FtsoVote(3, 1)]
+    assert second == calculate_median([FtsoVote(3, 1), FtsoVote(1, 1), FtsoVote(2, 1)])
@@ -1,6 +1,17 @@
+import pickle
+import random
+
+import attrs
 import pytest
 
-from py_flare_common.ftso.median import FtsoMedian, FtsoVote, calculate_median
+from py_flare_common.ftso.median import (
+    FtsoMedian,
+    FtsoQuartiles,
+    FtsoVote,
+    FtsoVotes,
+    calculate_median,
+    calculate_medians,
+)
 
 
 class TestCalculateMedian:
@@ -83,3 +94,124 @@ class TestCalculateMedian:
         assert median.sorted_votes == [
             FtsoVote(1, 2), FtsoVote(4, 7), FtsoVote(5, 1), FtsoVote(8, 4), FtsoVote(9, 2), FtsoVote(11, 6)
         ]  # fmt: skip
+
+    def test_input_not_modified(self):
+        votes = [FtsoVote(3, 1), FtsoVote(1, 1), FtsoVote(2, 1)]
+        median = calculate_median(votes)
+        assert votes == [FtsoVote(3, 1), FtsoVote(1, 1), FtsoVote(2, 1)]
+        assert median is not None
+        assert median.value == 2
+
+    def test_lazy_sorted_votes(self):
+        votes = [FtsoVote(3, 1), FtsoVote(1, 1), FtsoVote(3, 2), FtsoVote(2, 1)]
+        expected = [FtsoVote(1, 1), FtsoVote(2, 1), FtsoVote(3, 1), FtsoVote(3, 2)]
+
+        median = calculate_median(votes)
+        assert median is not None
+        assert median.sorted_votes == expected
+        assert isinstance(median.sorted_votes, list)
+
+        # Array backed votes are only sorted when read
+        lazy = calculate_median(FtsoVotes.from_votes(votes))
+        assert lazy is not None
+        assert len(lazy.sorted_votes) == 4
+        assert lazy.sorted_votes == expected
+        assert lazy.sorted_votes[0] == FtsoVote(1, 1)
+        assert lazy == median
+        assert repr(lazy) == repr(median)
+        assert list(attrs.asdict(lazy)["sorted_votes"]) == expected
+        assert pickle.loads(pickle.dumps(lazy)) == median
+
+    def test_zero_weight(self):
+        with pytest.raises(ValueError):
+            calculate_median([FtsoVote(1, 0), FtsoVote(2, 0)])
+
+
+class TestCalculateMedians:
+    def test_empty(self):
+        assert calculate_medians([], [1, 2]) == []
+        assert calculate_medians([[None, None], [1, 2]], [1, 2])[0] is None
+        assert calculate_medians([[1, 2]], [0, 0]) == [None]
+
+    def test_matches_calculate_median(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            n = rng.randint(1, 20)
+            weights = [rng.choice([0, 1, 2, 5, 100]) for _ in range(n)]
+            columns = [
+                [None if rng.random() < 0.2 else rng.randint(-10, 10) for _ in range(n)]
+                for _ in range(3)
+            ]
+            if sum(weights) == 0:
+                weights[0] = 1
+
+            for column, result in zip(
+                columns, calculate_medians(columns, weights), strict=True
+            ):
+                votes = [
+                    FtsoVote(v, w)
+                    for v, w in zip(column, weights, strict=True)
+                    if v is not None
+                ]
+                if sum(v.weight for v in votes) == 0:
+                    assert result is None
+                    continue
+
+                median = calculate_median(votes)
+                assert median is not None
+                assert result == FtsoQuartiles(
+                    median.value, median.first_quartile, median.third_quartile
+                )
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            calculate_medians([[1, 2, 3]], [1, 2])
+
+
+class TestFtsoVotes:
+    def test_sequence(self):
+        votes = FtsoVotes([3, 1, 2], [10, 20, 30])
+        assert len(votes) == 3
+        assert votes[1] == FtsoVote(1, 20)
+        assert votes[-1] == FtsoVote(2, 30)
+        assert list(votes) == [FtsoVote(3, 10), FtsoVote(1, 20), FtsoVote(2, 30)]
+        assert votes[1:] == FtsoVotes([1, 2], [20, 30])
+        assert FtsoVotes.from_votes(list(votes)) == votes
+
+        votes.append(5, 1)
+        assert votes[3] == FtsoVote(5, 1)
+
+        with pytest.raises(ValueError):
+            FtsoVotes([1], [])
+
+    def test_calculate_median(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            votes = [
+                FtsoVote(rng.randint(-50, 50), rng.randint(1, 10))
+                for _ in range(rng.randint(1, 30))
+            ]
+            median = calculate_median(FtsoVotes.from_votes(votes))
+            assert median == calculate_median(votes)
+
+        assert calculate_median(FtsoVotes()) is None
+
+    def test_calculate_median_snapshot(self):
+        votes = FtsoVotes([3, 1, 2], [1, 1, 1])
+        median = calculate_median(votes)
+        votes.append(0, 100)
+        votes.values[0] = 10
+
+        assert median is not None
+        assert median.sorted_votes == [FtsoVote(1, 1), FtsoVote(2, 1), FtsoVote(3, 1)]
+
+    def test_calculate_medians(self):
+        columns = [FtsoVotes([1, 5, 3], [1, 1, 1]), FtsoVotes(), [2, None]]
+        assert calculate_medians(columns, [1, 1]) == [
+            FtsoQuartiles(3, 1, 5),
+            None,
+            FtsoQuartiles(2, 2, 2),
+        ]
+        assert calculate_medians(columns[:2]) == [FtsoQuartiles(3, 1, 5), None]
+        with pytest.raises(ValueError):
+            calculate_medians([[1, 2]])
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from py_flare_common.fsp.epoch.factory import RewardEpochFactory
+from py_flare_common.fsp.messaging.batch import PayloadBatch
+from py_flare_common.fsp.messaging.types import FtsoSubmit2
+from py_flare_common.ftso.median import FtsoVote, calculate_median
+from py_flare_common.ftso.pipeline import reward_epoch_medians, voting_round_ids
+
+FACTORY = RewardEpochFactory(1658430000, 302400, 1658430000, 90, 45, 223)
+PROVIDERS = ["0xa", "0xb", "0xc", "0xd"]
+WEIGHTS = {"0xa": 10, "0xb": 20, "0xc": 30, "0xd": 0}
+
+
+def make_batch(voting_round_id: int, rng: random.Random, protocol_id=100):
+    batch = PayloadBatch(protocol_id, voting_round_id)
+    for provider in PROVIDERS:
+        values = [rng.choice([None, rng.randint(-100, 100)]) for _ in range(5)]
+        batch.payloads.append(FtsoSubmit2(0, values))
+        batch.senders.append(provider)
+    return batch
+
+
+def test_voting_round_ids():
+    rounds = voting_round_ids(FACTORY.make_epoch(1))
+    assert len(rounds) == 3360
+    assert rounds[0] == 3360
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reward_epoch_medians(workers):
+    rng = random.Random(0)
+    reward_epoch = FACTORY.make_epoch(1)
+    batches = [make_batch(r, rng) for r in range(3360, 3380)]
+    reveals = [
+        make_batch(10, rng),
+        *batches,
+        make_batch(3370, rng, protocol_id=200),
+    ]
+
+    results = list(
+        reward_epoch_medians(
+            reward_epoch, reveals, WEIGHTS, workers=workers, prefetch=1
+        )
+    )
+    assert [r.voting_round_id for r in results] == list(range(3360, 3380))
+
+    for result, batch in zip(results, batches, strict=True):
+        assert len(result.medians) == 5
+        for feed, median in enumerate(result.medians):
+            votes = [
+                FtsoVote(payload.values[feed], WEIGHTS[sender])
+                for sender, payload in zip(batch.senders, batch.payloads, strict=True)
+                if payload.values[feed] is not None and WEIGHTS[sender] > 0
+            ]
+            if not votes:
+                assert median is None
+            else:
+                assert median == calculate_median(votes)
+
+
+def test_reward_epoch_medians_replaced_reveal():
+    batch = PayloadBatch(100, 3360)
+    batch.payloads.extend([FtsoSubmit2(0, [1]), FtsoSubmit2(0, [5])])
+    batch.senders.extend(["0xa", "0xa"])
+
+    (result,) = reward_epoch_medians(FACTORY.make_epoch(1), [batch], WEIGHTS)
+    assert result.medians[0] is not None
+    assert result.medians[0].value == 5
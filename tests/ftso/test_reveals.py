@@ -0,0 +1,86 @@
+import pytest
+
+from py_flare_common.fsp.messaging.byte_parser import ParseError
+from py_flare_common.fsp.messaging.parse import MISSING_FEED_VALUE, ftso_submit2
+from py_flare_common.fsp.messaging.types import FtsoSubmit2
+from py_flare_common.ftso.median import FtsoQuartiles, FtsoVote, FtsoVotes
+from py_flare_common.ftso.reveals import RevealMatrix
+
+
+def payload(values: list[int | None]) -> bytes:
+    encoded = b"".join((0 if v is None else v + 2**31).to_bytes(4) for v in values)
+    return b"\x01" * 32 + encoded
+
+
+ROWS = [[1, None, -3], [4, 5], None, [7, 8, 9, 10]]
+
+
+@pytest.fixture(params=["submits", "payloads"])
+def matrix(request):
+    if request.param == "submits":
+        submits = [None if r is None else FtsoSubmit2(1, r) for r in ROWS]
+        return RevealMatrix.from_submits(submits, n_feeds=3)
+    return RevealMatrix.from_payloads(
+        [None if r is None else payload(r) for r in ROWS], n_feeds=3
+    )
+
+
+def test_reveal_matrix(matrix):
+    assert matrix.n_providers == 4
+    assert matrix.n_feeds == 3
+
+    assert matrix.feed_values(0) == [1, 4, None, 7]
+    assert matrix.feed_values(1) == [None, 5, None, 8]
+    assert matrix.feed_values(2) == [-3, None, None, 9]
+    assert matrix.provider_values(0) == [1, None, -3]
+    assert matrix.provider_values(2) == [None, None, None]
+    assert matrix.value(3, 2) == 9
+    assert matrix.value(1, 2) is None
+
+    column = matrix.column(0)
+    assert column.format == "i"
+    assert column.tolist() == [1, 4, MISSING_FEED_VALUE, 7]
+    assert matrix.mask(1).tolist() == [0, 1, 0, 1]
+
+
+def test_reveal_matrix_column_is_view(matrix):
+    column = matrix.column(1)
+    matrix._values[matrix.n_providers + 1] = 42
+    assert column[1] == 42
+
+
+def test_reveal_matrix_votes(matrix):
+    assert matrix.votes(1, [10, 20, 30, 40]) == [FtsoVote(5, 20), FtsoVote(8, 40)]
+    assert matrix.feed_votes(1, [10, 20, 30, 40]) == FtsoVotes([5, 8], [20, 40])
+    with pytest.raises(ValueError):
+        matrix.votes(1, [10])
+
+
+def test_reveal_matrix_medians(matrix):
+    assert matrix.medians([1, 1, 1, 1]) == [
+        FtsoQuartiles(4, 1, 7),
+        FtsoQuartiles(6, 5, 8),
+        FtsoQuartiles(3, -3, 9),
+    ]
+
+
+def test_reveal_matrix_default_feeds():
+    matrix = RevealMatrix.from_payloads([payload(r) for r in ROWS if r is not None])
+    assert matrix.n_feeds == 4
+    assert matrix.feed_values(3) == [None, None, 10]
+    assert ftso_submit2(payload(ROWS[0])).values == matrix.provider_values(0)[:3]
+
+
+def test_reveal_matrix_errors(matrix):
+    with pytest.raises(IndexError):
+        matrix.column(3)
+    with pytest.raises(IndexError):
+        matrix.value(4, 0)
+    with pytest.raises(ParseError):
+        RevealMatrix.from_payloads([b"\x00" * 10])
+
+
+def test_reveal_matrix_empty():
+    matrix = RevealMatrix([])
+    assert matrix.n_providers == 0
+    assert matrix.n_feeds == 0
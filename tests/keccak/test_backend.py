@@ -0,0 +1,40 @@
+import pytest
+
+from py_flare_common.keccak import (
+    available_backends,
+    get_backend,
+    keccak,
+    keccak_many,
+    set_backend,
+)
+
+EMPTY_KECCAK = "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+ABC_KECCAK = "4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45"
+
+
+@pytest.fixture
+def backend():
+    current = get_backend()
+    yield
+    set_backend(current)
+
+
+def test_default_backend():
+    assert get_backend() == available_backends()[0]
+    assert "eth-hash" in available_backends()
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backends(backend, name):
+    set_backend(name)
+    assert get_backend() == name
+    assert keccak(b"").hex() == EMPTY_KECCAK
+    assert keccak(b"abc").hex() == ABC_KECCAK
+    assert keccak(bytearray(b"abc")).hex() == ABC_KECCAK
+    assert keccak(memoryview(b"abc")).hex() == ABC_KECCAK
+    assert [h.hex() for h in keccak_many([b"", b"abc"])] == [EMPTY_KECCAK, ABC_KECCAK]
+
+
+def test_unknown_backend(backend):
+    with pytest.raises(ValueError):
+        set_backend("sha256")
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from py_flare_common.merkle import IncrementalMerkleTree, MerkleTree
+
+
+def test_incremental_matches_merkle_tree():
+    rng = random.Random(1)
+    values = [hex(rng.randrange(1, 2**256)) for _ in range(60)]
+
+    incremental_tree = IncrementalMerkleTree()
+    assert incremental_tree.root is None
+
+    inserted: list[str] = []
+    for i in range(0, len(values), 7):
+        batch = values[i : i + 7]
+        inserted += batch
+        incremental_tree.insert(batch)
+
+        merkle_tree = MerkleTree(inserted)
+        assert incremental_tree.root == merkle_tree.root
+        assert incremental_tree.tree == merkle_tree.tree
+        for value in batch:
+            assert incremental_tree.get_proof(value) == merkle_tree.get_proof(value)
+
+
+def test_incremental_deduplicates():
+    incremental_tree = IncrementalMerkleTree(["0x1", "0x2"])
+    assert incremental_tree.insert(["0x2", "0x02", "0x3"]) == 1
+    assert incremental_tree.insert(["0x3"]) == 0
+    assert incremental_tree.hash_count == 3
+    assert incremental_tree.root == MerkleTree(["0x1", "0x2", "0x3"]).root
+    assert incremental_tree.contains("0x3")
+
+
+def test_incremental_constructors():
+    values = ["0x1", "0x2", "0x3"]
+    merkle_tree = MerkleTree(values)
+
+    sorted_tree = IncrementalMerkleTree.from_sorted_iter(values)
+    assert isinstance(sorted_tree, IncrementalMerkleTree)
+    assert sorted_tree.root == merkle_tree.root
+
+    nodes_tree = IncrementalMerkleTree.from_nodes(sorted_tree._nodes)
+    assert nodes_tree.tree == merkle_tree.tree
+
+    for tree in (sorted_tree, nodes_tree):
+        assert tree.insert(["0x4"]) == 1
+        assert tree.root == MerkleTree([*values, "0x4"]).root
+
+    with pytest.raises(ValueError):
+        IncrementalMerkleTree.from_sorted_iter(["0x2", "0x1"])
+    with pytest.raises(ValueError):
+        IncrementalMerkleTree.from_sorted_iter(values, initial_hash=True)
@@ -1,4 +1,12 @@
-from py_flare_common.merkle import MerkleTree
+import pytest
+
+from py_flare_common.merkle import (
+    BytesMerkleTree,
+    MerkleTree,
+    single_hash,
+    verify_with_merkle_proof,
+    verify_with_merkle_proofs,
+)
 
 
 def test_examples():
@@ -169,3 +177,174 @@ def test_proofs_gen():
         for el in tree:
             proof = merkle_tree.get_proof(el["element"])
             assert proof == el["proof"]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 4, 5, 8, 13, 32, 100])
+@pytest.mark.parametrize("initial_hash", [False, True])
+def test_bytes_tree_matches_hex_tree(n, initial_hash):
+    values = [hex(i * 7919 + 1) for i in range(n)] + [hex(1)]
+    merkle_tree = MerkleTree(values, initial_hash=initial_hash)
+    bytes_tree = BytesMerkleTree(values, initial_hash=initial_hash)
+
+    assert bytes_tree.root == merkle_tree.root
+    assert bytes_tree.root_bigint == merkle_tree.root_bigint
+    assert bytes_tree.tree == merkle_tree.tree
+    assert bytes_tree.hash_count == merkle_tree.hash_count
+    assert bytes_tree.sorted_hashes == merkle_tree.sorted_hashes
+    for i in range(-1, bytes_tree.hash_count + 1):
+        assert bytes_tree.get_hash(i) == merkle_tree.get_hash(i)
+    if not initial_hash:
+        for value in values:
+            assert bytes_tree.get_proof(value) == merkle_tree.get_proof(value)
+
+
+def test_bytes_tree_bytes_input():
+    values = ["0x1", "0x2", "0x3"]
+    bytes_tree = BytesMerkleTree(int(v, 16).to_bytes(32) for v in values)
+    assert bytes_tree.root == MerkleTree(values).root
+    assert bytes_tree.root_bytes == bytes.fromhex(bytes_tree.root[2:])
+    assert bytes_tree.get_proof(b"\x02") == MerkleTree(values).get_proof("0x2")
+    assert bytes_tree.get_proof("0x4") is None
+
+
+def test_bytes_tree_invalid_values():
+    with pytest.raises(ValueError):
+        BytesMerkleTree(["0xzz"])
+    with pytest.raises(ValueError):
+        BytesMerkleTree([b"\x01" * 33])
+
+
+def test_bytes_tree_empty():
+    bytes_tree = BytesMerkleTree([])
+    assert bytes_tree.root is None
+    assert bytes_tree.tree == []
+    assert bytes_tree.get_proof("0x1") is None
+
+
+@pytest.mark.parametrize("tree_class", [MerkleTree, BytesMerkleTree])
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 16, 33])
+def test_get_proofs(tree_class, n):
+    values = [hex(i * 104729 + 3) for i in range(n)]
+    merkle_tree = tree_class(values)
+    targets = [*values, "0x2", values[0]]
+
+    proofs = merkle_tree.get_proofs(targets)
+    assert proofs == [merkle_tree.get_proof(t) for t in targets]
+    assert proofs[n] is None
+
+    bytes_proofs = merkle_tree.get_proofs(targets, as_bytes=True)
+    for proof, bytes_proof in zip(proofs, bytes_proofs, strict=True):
+        if proof is None:
+            assert bytes_proof is None
+        else:
+            assert ["0x" + b.hex() for b in bytes_proof] == proof
+
+
+@pytest.mark.parametrize("tree_class", [MerkleTree, BytesMerkleTree])
+def test_all_proofs(tree_class):
+    values = [hex(i) for i in range(1, 12)]
+    merkle_tree = tree_class(values)
+    assert merkle_tree.all_proofs() == [
+        merkle_tree.get_proof(h) for h in merkle_tree.sorted_hashes
+    ]
+    assert tree_class([]).all_proofs() == []
+
+
+@pytest.mark.parametrize("tree_class", [MerkleTree, BytesMerkleTree])
+@pytest.mark.parametrize("initial_hash", [False, True])
+def test_contains(tree_class, initial_hash):
+    values = [hex(i) for i in range(1, 10)]
+    merkle_tree = tree_class(values, initial_hash=initial_hash)
+
+    for i, leaf in enumerate(merkle_tree.sorted_hashes):
+        assert merkle_tree.contains(leaf)
+        assert merkle_tree.get_proof(leaf) == merkle_tree.all_proofs()[i]
+    assert not merkle_tree.contains("0xa")
+    assert not tree_class([]).contains("0x1")
+    assert tree_class([]).get_proof("0x1") is None
+
+
+@pytest.mark.parametrize("use_threads", [True, False])
+@pytest.mark.parametrize("initial_hash", [False, True])
+def test_bytes_tree_parallel_build(monkeypatch, use_threads, initial_hash):
+    monkeypatch.setattr("py_flare_common.merkle.tree._PARALLEL_MIN_BYTES", 64)
+    values = [hex(i * 7919 + 1) for i in range(300)]
+    serial_tree = BytesMerkleTree(values, initial_hash=initial_hash)
+    parallel_tree = BytesMerkleTree(
+        values, initial_hash=initial_hash, workers=3, use_threads=use_threads
+    )
+    assert parallel_tree.tree == serial_tree.tree
+    assert parallel_tree.all_proofs() == serial_tree.all_proofs()
+
+
+def test_verify_with_merkle_proofs():
+    values = [hex(i * 7919 + 1) for i in range(37)]
+    merkle_tree = MerkleTree(values)
+    leaves = merkle_tree.sorted_hashes
+    proofs = merkle_tree.all_proofs()
+
+    items = list(zip(leaves, proofs, strict=True))
+    assert verify_with_merkle_proofs(items, merkle_tree.root) == [
+        verify_with_merkle_proof(leaf, proof, merkle_tree.root) for leaf, proof in items
+    ]
+    assert all(verify_with_merkle_proofs(items, merkle_tree.root))
+
+    bytes_items = [
+        (bytes.fromhex(leaf[2:]), [bytes.fromhex(p[2:]) for p in proof])
+        for leaf, proof in items
+    ]
+    assert all(
+        verify_with_merkle_proofs(bytes_items, merkle_tree.root_bigint.to_bytes(32))
+    )
+
+    wrong_items = [(leaves[0], proofs[1]), (leaves[1], []), ("0x1234", proofs[0])]
+    assert verify_with_merkle_proofs(wrong_items, merkle_tree.root) == [False] * 3
+    assert verify_with_merkle_proofs(items[:1], "") == [False]
+
+    malformed = [
+        ("0xzz", proofs[0]),
+        (leaves[0], ["0x" + "1" * 66]),
+        items[0],
+    ]
+    assert verify_with_merkle_proofs(malformed, merkle_tree.root) == [
+        False,
+        False,
+        True,
+    ]
+
+
+@pytest.mark.parametrize("count", [None, 0, 5, 40, 41, 100])
+@pytest.mark.parametrize("initial_hash", [False, True])
+def test_bytes_tree_from_sorted_iter(count, initial_hash):
+    values = [hex(i * 7919 + 1) for i in range(40)]
+    leaves = sorted(int(v, 16).to_bytes(32) for v in values)
+    stream = (leaf for leaf in [leaves[0], *leaves, leaves[-1]])
+
+    bytes_tree = BytesMerkleTree.from_sorted_iter(
+        stream, count=count, initial_hash=initial_hash
+    )
+    merkle_tree = MerkleTree(values, initial_hash=initial_hash)
+    assert bytes_tree.tree == merkle_tree.tree
+    assert bytes_tree.all_proofs() == merkle_tree.all_proofs()
+
+
+@pytest.mark.parametrize("values", [[], ["0x1"], ["0x1", "0x2"]])
+def test_bytes_tree_from_sorted_iter_small(values):
+    bytes_tree = BytesMerkleTree.from_sorted_iter(iter(values), count=3)
+    assert bytes_tree.tree == MerkleTree(values).tree
+
+
+def test_bytes_tree_from_sorted_iter_unsorted():
+    with pytest.raises(ValueError):
+        BytesMerkleTree.from_sorted_iter(["0x1", "0x3", "0x2"])
+
+
+def test_single_hash_inputs():
+    expected = "0x" + "5fe7f977e71dba2ea1a68e21057beebb9be2ac30c6410aa38d4f3fbe41dcffd2"
+    assert single_hash("0x01") == expected
+    assert single_hash("01") == expected
+    assert single_hash(b"\x01") == expected
+    assert single_hash(bytearray(b"\x01")) == expected
+    assert single_hash(memoryview(b"\x01")) == expected
+    with pytest.raises(ValueError):
+        single_hash("0x0g")
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+from attrs import evolve
+
+from py_flare_common.merkle import (
+    BytesMerkleTree,
+    MerkleTree,
+    MultiProof,
+    get_multiproof,
+    verify_multiproof,
+)
+from py_flare_common.merkle.multiproof import process_multiproof
+
+
+@pytest.mark.parametrize("tree_class", [MerkleTree, BytesMerkleTree])
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 8, 21])
+def test_multiproof(tree_class, n):
+    rng = random.Random(n)
+    values = [hex(i * 7919 + 1) for i in range(n)]
+    merkle_tree = tree_class(values)
+
+    for k in range(n + 1):
+        targets = rng.sample(values, k)
+        multiproof = get_multiproof(merkle_tree, targets)
+        assert multiproof is not None
+        assert sorted(multiproof.leaves) == sorted(
+            "0x" + int(t, 16).to_bytes(32).hex() for t in targets
+        )
+        assert verify_multiproof(multiproof, merkle_tree.root)
+
+        individual = {h for t in targets for h in merkle_tree.get_proof(t)}
+        assert len(multiproof.proof) <= max(len(individual), 1)
+
+
+def test_multiproof_shared_siblings():
+    merkle_tree = MerkleTree(["0x1", "0x2", "0x3", "0x4"])
+    multiproof = get_multiproof(merkle_tree, ["0x1", "0x2"])
+    assert multiproof == MultiProof(
+        leaves=[merkle_tree.get_hash(1), merkle_tree.get_hash(0)],
+        proof=["0x2e174c10e159ea99b867ce3205125c24a42d128804e4070ed6fcc8cc98166aa0"],
+        proof_flags=[True, False],
+    )
+    assert process_multiproof(multiproof).hex() == merkle_tree.root[2:]
+
+
+def test_multiproof_invalid():
+    merkle_tree = MerkleTree([hex(i) for i in range(1, 10)])
+    assert get_multiproof(merkle_tree, ["0x1", "0xff"]) is None
+    assert get_multiproof(MerkleTree([]), []) is None
+
+    multiproof = get_multiproof(merkle_tree, ["0x1", "0x5", "0x9"])
+    assert multiproof is not None
+    assert not verify_multiproof(multiproof, merkle_tree.get_hash(0))
+    assert not verify_multiproof(
+        evolve(multiproof, leaves=multiproof.leaves[::-1]), merkle_tree.root
+    )
+    assert not verify_multiproof(
+        evolve(multiproof, proof=multiproof.proof[1:]), merkle_tree.root
+    )
+    assert not verify_multiproof(
+        evolve(multiproof, proof_flags=[not f for f in multiproof.proof_flags]),
+        merkle_tree.root,
+    )
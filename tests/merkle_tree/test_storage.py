@@ -0,0 +1,87 @@
+import pytest
+
+from py_flare_common.merkle import (
+    BytesMerkleTree,
+    IncrementalMerkleTree,
+    MerkleTree,
+    dump_tree,
+    load_tree,
+)
+
+
+@pytest.mark.parametrize("tree_class", [MerkleTree, BytesMerkleTree])
+@pytest.mark.parametrize("use_mmap", [True, False])
+@pytest.mark.parametrize("initial_hash", [False, True])
+@pytest.mark.parametrize("n", [0, 1, 2, 9])
+def test_dump_and_load(tmp_path, tree_class, use_mmap, initial_hash, n):
+    values = [hex(i * 7919 + 1) for i in range(n)]
+    merkle_tree = tree_class(values, initial_hash=initial_hash)
+
+    path = tmp_path / "tree.bin"
+    dump_tree(merkle_tree, path)
+    index_size = 8 * merkle_tree.hash_count if initial_hash else 0
+    assert path.stat().st_size == 16 + 32 * len(merkle_tree.tree) + index_size
+
+    loaded_tree = load_tree(path, use_mmap=use_mmap)
+    assert loaded_tree.initial_hash == initial_hash
+    assert loaded_tree.root == merkle_tree.root
+    assert loaded_tree.tree == merkle_tree.tree
+    for leaf in merkle_tree.sorted_hashes:
+        assert loaded_tree.get_proof(leaf) == merkle_tree.get_proof(leaf)
+
+
+def test_load_initial_hash_without_index(tmp_path):
+    values = [hex(i * 7919 + 1) for i in range(100)]
+    merkle_tree = BytesMerkleTree(values, initial_hash=True)
+
+    path = tmp_path / "tree.bin"
+    dump_tree(merkle_tree, path)
+    loaded_tree = load_tree(path)
+
+    # The leaf order is a view of the mapped file, not an in memory index
+    assert isinstance(loaded_tree._index, memoryview)
+    assert loaded_tree._index.obj is loaded_tree._nodes.obj
+    for i, leaf in enumerate(merkle_tree.sorted_hashes):
+        assert loaded_tree.binary_search(leaf) == i
+        assert loaded_tree.get_proof(leaf) == merkle_tree.get_proof(leaf)
+    assert loaded_tree.binary_search("0x" + "00" * 32) is None
+
+
+def test_load_version_1(tmp_path):
+    merkle_tree = MerkleTree([hex(i) for i in range(1, 6)], initial_hash=True)
+    nodes = b"".join(bytes.fromhex(node[2:]) for node in merkle_tree.tree)
+
+    path = tmp_path / "tree.bin"
+    path.write_bytes(
+        b"FMKT\x01\x01\x00\x00" + len(merkle_tree.tree).to_bytes(8) + nodes
+    )
+    loaded_tree = load_tree(path)
+    for leaf in merkle_tree.sorted_hashes:
+        assert loaded_tree.get_proof(leaf) == merkle_tree.get_proof(leaf)
+
+
+def test_dump_incremental(tmp_path):
+    incremental_tree = IncrementalMerkleTree(["0x1", "0x2"])
+    incremental_tree.insert(["0x3"])
+
+    path = tmp_path / "tree.bin"
+    dump_tree(incremental_tree, path)
+    assert load_tree(path).root == MerkleTree(["0x1", "0x2", "0x3"]).root
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"FMKX\x01\x00\x00\x00" + (0).to_bytes(8),
+        b"FMKT\x03\x00\x00\x00" + (0).to_bytes(8),
+        b"FMKT\x01\x00\x00\x00" + (1).to_bytes(8),
+        b"FMKT\x01\x00\x00\x00" + (2).to_bytes(8) + b"\x00" * 64,
+        b"FMKT\x02\x01\x00\x00" + (1).to_bytes(8) + b"\x00" * 32,
+    ],
+)
+def test_load_invalid(tmp_path, content):
+    path = tmp_path / "tree.bin"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        load_tree(path, use_mmap=False)
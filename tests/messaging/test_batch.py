@@ -0,0 +1,76 @@
+import pytest
+
+from py_flare_common.fsp.messaging import (
+    SubmitTx,
+    parse_submit2_tx,
+    parse_submit_signature_tx,
+    parse_tx_batch,
+)
+from py_flare_common.fsp.messaging.byte_parser import ParseError
+from py_flare_common.fsp.messaging.types import FdcSubmit2, FtsoSubmit2
+
+
+def ftso_message(voting_round_id: int, value: int) -> bytes:
+    payload = b"\x01" * 32 + (value + 2**31).to_bytes(4)
+    return b"d" + voting_round_id.to_bytes(4) + len(payload).to_bytes(2) + payload
+
+
+def fdc_message(voting_round_id: int) -> bytes:
+    payload = b"\x00\x02\x01"
+    return b"\xc8" + voting_round_id.to_bytes(4) + len(payload).to_bytes(2) + payload
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_tx_batch(workers):
+    txs = [
+        SubmitTx(ftso_message(10, 1) + fdc_message(10), "0xa", 100, 1000),
+        SubmitTx(ftso_message(10, 2).hex(), "0xb", 101, 1001),
+        ftso_message(11, 3),
+    ]
+
+    batches = parse_tx_batch(txs, parse_submit2_tx, workers=workers, chunksize=1)
+    assert set(batches) == {(100, 10), (200, 10), (100, 11)}
+
+    ftso = batches[(100, 10)]
+    assert len(ftso) == 2
+    assert ftso.payloads == [
+        FtsoSubmit2(int.from_bytes(b"\x01" * 32), [1]),
+        FtsoSubmit2(int.from_bytes(b"\x01" * 32), [2]),
+    ]
+    assert ftso.sizes == [36, 36]
+    assert ftso.senders == ["0xa", "0xb"]
+    assert ftso.block_numbers == [100, 101]
+    assert ftso.timestamps == [1000, 1001]
+
+    fdc = batches[(200, 10)]
+    assert fdc.payloads == [FdcSubmit2(2, [False, True])]
+    assert fdc.senders == ["0xa"]
+
+    assert batches[(100, 11)].senders == [None]
+
+
+def test_parse_tx_batch_errors():
+    txs = [ftso_message(10, 1), b"d\x00\x00\x00\x01\x00\x02\x00", "0xzz"]
+
+    with pytest.raises(ParseError):
+        parse_tx_batch(txs, parse_submit_signature_tx)
+
+    batches = parse_tx_batch(txs, parse_submit2_tx, skip_errors=True)
+    assert list(batches) == [(100, 10)]
+    assert len(batches[(100, 10)]) == 1
+
+
+def test_parse_tx_batch_unknown_signature_version():
+    unknown = b"\x07" + b"\x00" * 65
+    valid = b"\x01" + b"\x00" * 65
+    txs = [
+        b"d" + (10).to_bytes(4) + len(unknown).to_bytes(2) + unknown,
+        b"d" + (10).to_bytes(4) + len(valid).to_bytes(2) + valid,
+    ]
+
+    with pytest.raises(ParseError):
+        parse_tx_batch(txs, parse_submit_signature_tx)
+
+    batches = parse_tx_batch(txs, parse_submit_signature_tx, skip_errors=True)
+    assert list(batches) == [(100, 10)]
+    assert len(batches[(100, 10)]) == 1
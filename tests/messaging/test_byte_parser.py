@@ -0,0 +1,60 @@
+import pytest
+
+from py_flare_common.fsp.messaging.byte_parser import ByteParser, ParseError
+
+DATA = bytes(range(1, 97)) + b"\xff" * 32
+
+
+@pytest.mark.parametrize("zero_copy", [False, True])
+def test_ints(zero_copy):
+    bp = ByteParser(DATA, zero_copy=zero_copy)
+    offset = 0
+    for size in [1, 2, 4, 8, 16]:
+        for signed in [False, True]:
+            parse = getattr(bp, f"{'' if signed else 'u'}int{size * 8}")
+            expected = int.from_bytes(DATA[offset : offset + size], signed=signed)
+            assert parse() == expected
+            offset += size
+    assert bp.uint256() == int.from_bytes(DATA[62:94])
+    assert bp.next_n(2) == DATA[94:96]
+    assert bp.int256() == -1
+    assert bp.is_empty()
+
+
+def test_zero_copy_shares_buffer():
+    data = bytearray(DATA)
+    bp = ByteParser(data, zero_copy=True)
+    sub = bp.sub_parser(8)
+    head = sub.next_n(4)
+    rest = bp.drain()
+
+    assert isinstance(head, memoryview)
+    assert isinstance(rest, memoryview)
+    data[0] = 0
+    data[8] = 0
+    assert head[0] == 0
+    assert rest[0] == 0
+    assert sub.uint32() == 0x05060708
+    assert sub.is_empty()
+
+
+@pytest.mark.parametrize("zero_copy", [False, True])
+def test_sub_parser(zero_copy):
+    bp = ByteParser(DATA, zero_copy=zero_copy)
+    bp.uint8()
+    sub = bp.sub_parser(3)
+    assert len(sub) == 3
+    assert sub.uint16() == 0x0203
+    assert bytes(sub.drain()) == b"\x04"
+    assert bp.uint8() == 5
+
+    with pytest.raises(ParseError):
+        sub.uint8()
+    with pytest.raises(ParseError):
+        bp.sub_parser(len(DATA))
+
+
+def test_copy_mode_returns_bytes():
+    bp = ByteParser(DATA)
+    assert isinstance(bp.next_n(2), bytes)
+    assert isinstance(bp.sub_parser(2).drain(), bytes)
@@ -3,8 +3,12 @@ import pytest
 from py_flare_common._hexstr.hexstr import to_bytes
 from py_flare_common.fsp.messaging.byte_parser import ParseError
 from py_flare_common.fsp.messaging.parse import (
+    MISSING_FEED_VALUE,
+    decode_feed_values,
+    decode_feed_values_array,
     fdc_submit1,
     fdc_submit2,
+    fdc_submit2_packed,
     ftso_submit1,
     ftso_submit2,
     parse_generic_tx,
@@ -19,6 +23,8 @@ from py_flare_common.fsp.messaging.types import (
     FdcSubmit2,
     FtsoSubmit1,
     FtsoSubmit2,
+    LazyParsedPayload,
+    PackedBitvector,
     ParsedMessage,
     ParsedPayload,
     Signature,
@@ -132,6 +138,46 @@ class TestSubmit:
         with pytest.raises(ParseError):
             parse_generic_tx(message)
 
+    def test_gen_parse_lazy(self):
+        message = (b"d" + b"\x00\x00\x00\x01" + b"\x00\x02" + b"\x00\x00") + (
+            b"\xc8" + b"\x00\x00\x00\x02" + b"\x00\x02" + b"\x00\x01"
+        )
+        calls = []
+
+        def parse(x):
+            calls.append(bytes(x))
+            return bytes(x) + b"100"
+
+        parsed_message = parse_generic_tx(message, parse, lazy=True)
+        eager = parse_generic_tx(message, parse)
+        calls.clear()
+
+        ftso = parsed_message.ftso
+        assert isinstance(ftso, LazyParsedPayload)
+        assert (ftso.protocol_id, ftso.voting_round_id, ftso.size) == (100, 1, 2)
+        assert not ftso.decoded
+        assert calls == []
+
+        assert ftso.payload == b"\x00\x00100"
+        assert ftso.payload == b"\x00\x00100"
+        assert ftso.decoded
+        assert calls == [b"\x00\x00"]
+        assert ftso.to_parsed() == eager.ftso
+
+        fdc = parsed_message.fdc
+        assert isinstance(fdc, LazyParsedPayload)
+        assert fdc.payload == b"\x00\x01"
+
+    def test_gen_parse_lazy_error(self):
+        message = b"d" + b"\x00\x00\x00\x01" + b"\x00\x02" + b"\x00\x00"
+        parsed_message = parse_submit1_tx(message, lazy=True)
+
+        ftso = parsed_message.ftso
+        assert ftso is not None
+        assert ftso.voting_round_id == 1
+        with pytest.raises(ParseError):
+            _ = ftso.payload
+
     @pytest.mark.parametrize(
         "data, excepted",
         [
@@ -146,7 +192,14 @@ class TestSubmit:
     def test_to_bytes(self, data, excepted):
         assert to_bytes(data) == excepted
 
-    @pytest.mark.parametrize("data", ["x0", "0xx"])
+    @pytest.mark.parametrize("data", [b"\x00\x01", b"\x57\xee\xd5\x80\x00\x01"])
+    @pytest.mark.parametrize("buffer", [bytearray, memoryview])
+    def test_to_bytes_buffer(self, data, buffer):
+        b = to_bytes(buffer(data))
+        assert isinstance(b, buffer)
+        assert bytes(b) == b"\x00\x01"
+
+    @pytest.mark.parametrize("data", ["x0", "0xx", "0 0", "0x0g"])
     def test_to_bytes_wrong_string(self, data):
         with pytest.raises(ValueError):
             to_bytes(data)
@@ -415,6 +468,28 @@ class TestFtsoSubmit:
         with pytest.raises(ParseError):
             ftso_submit2(payload)
 
+    @pytest.mark.parametrize(
+        "data, values",
+        [
+            (b"", []),
+            (b"\x00\x00\x00\x00", [None]),
+            (b"\x80\x00\x00\x00", [0]),
+            (b"\x00\x00\x00\x01", [1 - 2**31]),
+            (b"\xff\xff\xff\xff", [2**31 - 1]),
+            (b"\x07[\xcd\x15\x00\x00\x00\x00\x80\x00\x00\x02", [123456789 - 2**31, None, 2]),
+        ],
+    )  # fmt: skip
+    def test_decode_feed_values(self, data, values):
+        assert decode_feed_values(data) == values
+        assert decode_feed_values(memoryview(data)) == values
+        assert decode_feed_values_array(data).tolist() == [
+            MISSING_FEED_VALUE if v is None else v for v in values
+        ]
+
+    def test_decode_feed_values_parse_error(self):
+        with pytest.raises(ParseError):
+            decode_feed_values(b"\x00\x00\x00")
+
 
 class TestFdcSubmit:
     def test_fdc_submit1(self):
@@ -447,6 +522,52 @@ class TestFdcSubmit:
         assert fdc_s2.number_of_requests == n_requests
         assert fdc_s2.bit_vector == bit_vector
 
+        packed = fdc_submit2_packed(payload)
+        assert isinstance(packed, PackedBitvector)
+        assert len(packed) == n_requests
+        assert [packed[i] for i in range(n_requests)] == bit_vector
+        assert packed.to_list() == bit_vector
+        assert packed.popcount() == sum(bit_vector)
+        assert packed == PackedBitvector.from_list(bit_vector)
+        assert packed.to_bitvector() == fdc_s2
+        with pytest.raises(IndexError):
+            packed[n_requests]
+
+    def test_packed_bitvector_operations(self):
+        a = PackedBitvector.from_list(
+            [True, True, False, False, True, False, True, True, False]
+        )
+        b = PackedBitvector.from_list(
+            [True, False, True, False, True, True, False, True, False]
+        )
+        assert (a & b).to_list() == [
+            True,
+            False,
+            False,
+            False,
+            True,
+            False,
+            False,
+            True,
+            False,
+        ]
+        assert (a | b).to_list() == [
+            True,
+            True,
+            True,
+            False,
+            True,
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert (a & b).popcount() == 3
+        assert PackedBitvector.from_list([]).to_list() == []
+
+        with pytest.raises(ValueError):
+            a & PackedBitvector.from_list([True])
+
     @pytest.mark.parametrize(
         "payload",
         [b"\x00\x03\x0b"],
@@ -454,3 +575,5 @@ class TestFdcSubmit:
     def test_fdc_submit2_parse_error(self, payload):
         with pytest.raises(ParseError):
             fdc_submit2(payload)
+        with pytest.raises(ParseError):
+            fdc_submit2_packed(payload)
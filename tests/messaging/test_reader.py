@@ -0,0 +1,102 @@
+import pytest
+
+from py_flare_common.fsp.messaging import (
+    parse_submit2_tx,
+    parse_submit_signature_tx,
+    read_message_batches,
+    read_messages,
+)
+from py_flare_common.fsp.messaging.byte_parser import ParseError
+from py_flare_common.fsp.messaging.reader import iter_dump, write_binary_dump
+
+
+def ftso_message(voting_round_id: int, value: int) -> bytes:
+    payload = b"\x01" * 32 + (value + 2**31).to_bytes(4)
+    return b"d" + voting_round_id.to_bytes(4) + len(payload).to_bytes(2) + payload
+
+
+SUBMIT2_SELECTOR = b"\x9d\x00\xc9\xfd"
+MESSAGES = [SUBMIT2_SELECTOR + ftso_message(i, i) for i in range(25)]
+
+
+@pytest.fixture
+def hex_dump(tmp_path):
+    path = tmp_path / "dump.txt"
+    lines = [("0x" if i % 2 else "") + m.hex() for i, m in enumerate(MESSAGES)]
+    path.write_text("\n".join(lines[:10]) + "\n\n" + "\n".join(lines[10:]) + "\n")
+    return path
+
+
+@pytest.fixture
+def binary_dump(tmp_path):
+    path = tmp_path / "dump.bin"
+    write_binary_dump(path, MESSAGES)
+    return path
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+@pytest.mark.parametrize(
+    "dump, format", [("hex_dump", "hex"), ("binary_dump", "binary")]
+)
+def test_read_messages(request, dump, format, use_mmap):
+    path = request.getfixturevalue(dump)
+
+    progress = []
+    messages = list(
+        read_messages(
+            path,
+            parse_submit2_tx,
+            format=format,
+            use_mmap=use_mmap,
+            progress=progress.append,
+            progress_every=10,
+        )
+    )
+
+    assert messages == [parse_submit2_tx(m) for m in MESSAGES]
+    assert [p.messages for p in progress] == [10, 20, 25]
+    assert progress[-1].bytes_read == progress[-1].total_bytes == path.stat().st_size
+    assert progress[-1].bytes_per_second >= 0
+
+
+@pytest.mark.parametrize(
+    "dump, format", [("hex_dump", "hex"), ("binary_dump", "binary")]
+)
+def test_read_message_batches(request, dump, format):
+    path = request.getfixturevalue(dump)
+
+    batches = list(read_message_batches(path, parse_submit2_tx, 10, format=format))
+    assert [len(b) for b in batches] == [10, 10, 5]
+    assert [m for b in batches for m in b] == [parse_submit2_tx(m) for m in MESSAGES]
+
+
+def test_read_empty(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    assert list(read_messages(path, parse_submit2_tx)) == []
+    assert list(read_messages(path, parse_submit2_tx, format="binary")) == []
+
+
+def test_read_errors(tmp_path):
+    path = tmp_path / "dump.txt"
+    path.write_text(MESSAGES[0].hex() + "\nzz\n" + MESSAGES[1].hex() + "\n")
+
+    with pytest.raises(ValueError):
+        list(read_messages(path, parse_submit2_tx))
+    assert len(list(read_messages(path, parse_submit2_tx, skip_errors=True))) == 2
+
+    payload = b"\x07" + b"\x00" * 65
+    unknown_version = b"d" + (1).to_bytes(4) + len(payload).to_bytes(2) + payload
+    path = tmp_path / "signatures.txt"
+    path.write_text(unknown_version.hex() + "\n")
+    with pytest.raises(ParseError):
+        list(read_messages(path, parse_submit_signature_tx))
+    assert list(read_messages(path, parse_submit_signature_tx, skip_errors=True)) == []
+
+    path = tmp_path / "dump.bin"
+    path.write_bytes(b"\x00\x00\x00\x05abc")
+    with pytest.raises(ParseError):
+        list(iter_dump(path, "binary"))
+
+    with pytest.raises(ValueError):
+        list(iter_dump(path, "csv"))  # type: ignore
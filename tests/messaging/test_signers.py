@@ -0,0 +1,85 @@
+import pytest
+
+from py_flare_common.fsp.messaging.parse import submit_signatures
+from py_flare_common.fsp.messaging.signers import (
+    message_digest,
+    recover_signer,
+    recover_signers,
+    signature_weight,
+)
+from py_flare_common.fsp.messaging.types import SubmitSignaturesMessage
+
+# Signed with eth_account, private keys b"\x01" * 32 and b"\x02" * 32
+VECTORS = [
+    (
+        "0x1a642f0E3c3aF545E7AcBD38b07251B3990914F1",
+        100, 123456, 1, "ab" * 32, "1c",
+        "9c2e45793979a4fb4e2c3c39e131f4f6cc070c2f4a1a3dd4887882234ffda598",
+        "7955d5bf369f423e02a481b83e5a1297e55924c9bf47a6793288a29a8187112b",
+        "46fb6d9e9ce0e8b460bc83d30dc1247d8673f6db02185ec30afc8e3d4e9f6695",
+    ),
+    (
+        "0x5050A4F4b3f9338C3472dcC01A87C76A144b3c9c",
+        200, 7, 0, "01" * 32, "1b",
+        "ed8b32a9f9092624841236bcbecfe83e0da58ea26f3c6cd6d1e3c208b9aa6d92",
+        "2e2bab49c6fff54d4184667537984613b6da2ba524658a82d7c986a218a66e3a",
+        "b12490f353914e0fc786480110a942c6748558f6ecc7bd7e56a1165901fd5610",
+    ),
+]  # fmt: skip
+
+
+def submit_payload(pid, round_id, secure, root, v, r, s, type=0):
+    signature = bytes.fromhex(v + r + s)
+    if type == 1:
+        return b"\x01" + signature
+    message = pid.to_bytes(1) + round_id.to_bytes(4) + secure.to_bytes(1)
+    return b"\x00" + message + bytes.fromhex(root) + signature
+
+
+@pytest.mark.parametrize("vector", VECTORS)
+def test_recover_signer(vector):
+    address, pid, round_id, secure, root, v, r, s, digest = vector
+    message = SubmitSignaturesMessage(pid, secure, root)
+
+    assert message_digest(message, round_id).hex() == digest
+    assert recover_signer(bytes.fromhex(digest), v, r, s) == address
+    assert recover_signer(bytes.fromhex(digest), int(v, 16) - 27, r, s) == address
+    assert recover_signer(bytes(32), v, r, s) != address
+
+
+def test_recover_signer_invalid():
+    digest = bytes(32)
+    assert recover_signer(digest, 29, 1, 1) is None
+    assert recover_signer(digest, 27, 0, 1) is None
+    assert recover_signer(digest, 27, 1, 2**256 - 1) is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_recover_signers(workers):
+    submits = [submit_signatures(submit_payload(*v[1:8])) for v in VECTORS]
+
+    signers = recover_signers(submits, VECTORS[0][2], workers=workers)
+    assert signers[0] == VECTORS[0][0]
+    # Second vector was signed for a different voting round
+    assert signers[1] != VECTORS[1][0]
+
+    assert recover_signers(submits[1:], VECTORS[1][2]) == [VECTORS[1][0]]
+
+
+def test_recover_signers_type_1():
+    address, pid, round_id, secure, root, v, r, s, _ = VECTORS[0]
+    submits = [
+        submit_signatures(submit_payload(pid, round_id, secure, root, v, r, s, 1))
+    ]
+    message = SubmitSignaturesMessage(pid, secure, root)
+
+    assert recover_signers(submits, round_id, message) == [address]
+    with pytest.raises(ValueError):
+        recover_signers(submits, round_id)
+
+
+def test_signature_weight():
+    a, b = VECTORS[0][0], VECTORS[1][0]
+    weights = {a: 10, b: 20}
+    assert signature_weight([a, a, None, "0x0"], weights) == 10
+    assert signature_weight([a, b], weights) == 30
@@ -1,4 +1,7 @@
+import pytest
+
 from py_flare_common.smart_accounts.encoder.decoder import Decoder
+from py_flare_common.smart_accounts.encoder.exceptions import DecodeError
 from py_flare_common.smart_accounts.encoder.instructions import (
     FxrpCollateralReservation,
 )
@@ -19,3 +22,18 @@ def test_encoder_decoder():
     v = decoded_cls.decode(expected)
 
     assert v == fcr
+
+
+def test_decode_buffer_input():
+    expected = "000d0000000000000000000d0001000000000000000000000000000000000000"
+    fcr = FxrpCollateralReservation(13, 13, 1)
+
+    for b in [bytes.fromhex(expected), bytearray.fromhex(expected)]:
+        assert FxrpCollateralReservation.decode(memoryview(b)) == fcr
+        assert FxrpCollateralReservation.decode(b) == fcr
+
+
+def test_decode_invalid_input_type():
+    # bytes(13) would silently decode 13 zero bytes
+    with pytest.raises(DecodeError):
+        FxrpCollateralReservation.decode(13)  # type: ignore